@@ -0,0 +1,153 @@
+import argparse
+import sys
+
+"""
+Command line entry point - run, save, report on and benchmark simulations without editing any code
+
+    python -m baseball simulate --games 100000 --engine batch --seed 42
+    python -m baseball persist --games 100000 --db baseball_db
+    python -m baseball report --db baseball_db
+    python -m baseball benchmark --output bench.json
+
+Only argparse is imported up front. Each subcommand imports what it needs when it runs, so
+'--help' and small runs do not pay for sqlite3, numpy or the engines they do not use.
+"""
+
+#----------
+# constants
+#----------
+ENGINES = ('game', 'bitmask', 'batch', 'innings')
+DEFAULT_DB = 'baseball_db'
+
+#--------
+# engines
+#--------
+
+def run_engine(engine, n_games, seed, workers):
+    """Run 'n_games' games with 'engine', and return the home and away scores."""
+    if engine == 'game':  # baseball_6.Game, split across processes
+        if workers == 1:
+            from baseball_runner import simulate_chunk
+            return simulate_chunk(0, seed, 0, n_games)
+        from baseball_runner import run_games
+        return run_games(n_games, workers, seed)
+    if engine == 'bitmask':
+        from baseball_adaptive import bitmask_batch
+        return bitmask_batch(seed)(n_games)
+    if engine == 'batch':
+        from baseball_batch import simulate
+        return simulate(n_games, seed)
+    if engine == 'innings':
+        from baseball_innings import InningsSampler
+        return InningsSampler(seed=seed).simulate(n_games)
+    raise ValueError(f'Unknown engine {engine!r}')
+
+#------------
+# subcommands
+#------------
+
+def simulate(args):
+    from baseball_stats import ScoreStats
+
+    home_scores, away_scores = run_engine(args.engine, args.games, args.seed, args.workers)
+    stats = ScoreStats()
+    stats.add_scores(home_scores, away_scores)
+    stats.print_results()
+
+def persist(args):
+    import sqlite3
+
+    from baseball_6 import setup_database
+    from baseball_bulk import BulkWriter
+
+    conn = sqlite3.connect(args.db)
+    has_scores = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scores'").fetchone()
+    if not args.append or not has_scores:  # appending to a new database starts a new table
+        setup_database(conn)
+    home_scores, away_scores = run_engine(args.engine, args.games, args.seed, args.workers)
+    first_game_id = conn.execute('SELECT COALESCE(MAX(game_id) + 1, 0) FROM scores').fetchone()[0]
+    with BulkWriter(conn, wal=True, synchronous='NORMAL') as writer:
+        writer.write_scores(home_scores, away_scores, first_game_id)
+    conn.close()
+    print(f'Wrote {writer.rows_written:,} rows to {args.db} at {writer.rows_per_second():,.0f} rows/sec')
+
+def report(args):
+    import os
+    import sqlite3
+
+    if not os.path.exists(args.db):
+        print(f'No games in {args.db}')
+        return
+    conn = sqlite3.connect(f'file:{args.db}?mode=ro', uri=True)
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scores'").fetchone():
+        conn.close()
+        print(f'No games in {args.db}')
+        return
+    games, home_wins, away_wins, home_average, away_average = conn.execute(
+        """
+        SELECT COUNT(*),
+            SUM(home_team_score > away_team_score),
+            SUM(home_team_score < away_team_score),
+            AVG(home_team_score),
+            AVG(away_team_score)
+        FROM scores
+        """).fetchone()
+    conn.close()
+    if not games:
+        print(f'No games in {args.db}')
+        return
+    print(f'{games:,} games. Average home score is {home_average:.3f}. Average away score is {away_average:.3f}.')
+    print(f'Home team won {home_wins / games:.2%}. Away team won {away_wins / games:.2%}. '
+        f'Result was a draw {(games - home_wins - away_wins) / games:.2%}.')
+
+def benchmark(args):
+    from baseball_bench import ENGINES, run_benchmarks, print_benchmarks
+
+    unknown = [name for name in args.engines if name not in ENGINES]
+    if unknown:
+        args.error(f'unknown engine {", ".join(unknown)} (choose from {", ".join(ENGINES)})')
+    print_benchmarks(run_benchmarks(args.engines, args.games, args.seed, args.output))
+
+#--------------------
+# the argument parser
+#--------------------
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog='python -m baseball', description='Baseball game simulator')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(subparser):
+        subparser.add_argument('--games', type=int, default=1_000, help='number of games (default %(default)s)')
+        subparser.add_argument('--engine', choices=ENGINES, default='bitmask', help='engine (default %(default)s)')
+        subparser.add_argument('--seed', type=int, default=None, help='random seed')
+        subparser.add_argument('--workers', type=int, default=1, help='processes, for the game engine (default %(default)s)')
+
+    subparser = subparsers.add_parser('simulate', help='run games and print the results')
+    add_run_options(subparser)
+    subparser.set_defaults(func=simulate)
+
+    subparser = subparsers.add_parser('persist', help='run games and save the scores to the database')
+    add_run_options(subparser)
+    subparser.add_argument('--db', default=DEFAULT_DB, help='database path (default %(default)s)')
+    subparser.add_argument('--append', action='store_true', help='add to the scores table instead of recreating it')
+    subparser.set_defaults(func=persist)
+
+    subparser = subparsers.add_parser('report', help='print the results saved in the database')
+    subparser.add_argument('--db', default=DEFAULT_DB, help='database path (default %(default)s)')
+    subparser.set_defaults(func=report)
+
+    subparser = subparsers.add_parser('benchmark', help='benchmark the engines')
+    subparser.add_argument('engines', nargs='*', help='engines to run (default all)')
+    subparser.add_argument('--games', type=int, default=200, help='number of games (default %(default)s)')
+    subparser.add_argument('--seed', type=int, default=42, help='random seed (default %(default)s)')
+    subparser.add_argument('--output', help='write the results to this file as JSON')
+    subparser.set_defaults(func=benchmark, error=subparser.error)
+
+    return parser
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import itertools
+import math
+from statistics import NormalDist
+from types import SimpleNamespace
+
+from baseball_6 import HOME, AWAY
+from baseball_bitmask import BitmaskGame
+from baseball_outcomes import BlockRandomSource
+from baseball_runner import run_games
+from baseball_stats import ScoreStats
+
+"""
+Adaptive stopping - keep running games only until the estimates are precise enough
+
+Games are run in batches. After each batch, confidence intervals are worked out for
+P(home win) (Wilson score interval) and for the expected home and away runs (normal
+approximation). As soon as every interval is narrower than the requested precision,
+the run stops, and reports how many games it used.
+"""
+
+#----------
+# constants
+#----------
+BATCH_SIZE = 1_000
+MAX_GAMES = 10_000_000
+CONFIDENCE = 0.95
+
+#----------
+# functions
+#----------
+
+def bitmask_batch(seed=None):
+    """Return a function that runs a batch of BitmaskGames, and returns (home_scores, away_scores)."""
+    next_score = BlockRandomSource(seed).next_score
+
+    def run_batch(n_games):
+        home_scores = []
+        away_scores = []
+        for game_id in range(n_games):
+            game = BitmaskGame(game_id)
+            while not game.game_over():
+                game.play(next_score())
+            home_scores.append(game.scores[HOME])
+            away_scores.append(game.scores[AWAY])
+        return home_scores, away_scores
+    return run_batch
+
+def runner_batch(seed=None, workers=None):
+    """Return a function that runs each batch with baseball_runner.run_games() across processes.
+
+    Every batch gets its own seed, so no two batches are the same games.
+    """
+    batches = itertools.count()
+
+    def run_batch(n_games):
+        batch_seed = None if seed is None else f'{seed}:{next(batches)}'
+        return run_games(n_games, workers, batch_seed)
+    return run_batch
+
+def wilson_interval(successes, trials, z):
+    """Return the (low, high) Wilson score interval for a proportion."""
+    if not trials:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - half_width, centre + half_width
+
+def mean_interval(stats, z):
+    """Return the (low, high) normal confidence interval for the mean of a RunningStats."""
+    if stats.count < 2:
+        return -math.inf, math.inf
+    half_width = z * stats.stdev() / math.sqrt(stats.count)
+    return stats.mean - half_width, stats.mean + half_width
+
+def estimate(win_precision=0.01, runs_precision=0.5, confidence=CONFIDENCE,
+        batch_size=BATCH_SIZE, max_games=MAX_GAMES, run_batch=None, seed=None):
+    """Run games until P(home win) is known to within +/- win_precision, and the
+    expected home and away runs to within +/- runs_precision, at the given confidence.
+
+    run_batch(n_games) must return (home_scores, away_scores), with new games on every call.
+    By default BitmaskGames are used. runner_batch() runs the batches across processes instead.
+    """
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, not {batch_size}')
+    if max_games < 1:
+        raise ValueError(f'max_games must be at least 1, not {max_games}')
+    if run_batch is None:
+        run_batch = bitmask_batch(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    stats = ScoreStats()
+
+    while True:
+        n_games = min(batch_size, max_games - stats.games)
+        stats.add_scores(*run_batch(n_games))
+
+        win_interval = wilson_interval(stats.home_wins, stats.games, z)
+        home_interval = mean_interval(stats.home, z)
+        away_interval = mean_interval(stats.away, z)
+        converged = (
+            (win_interval[1] - win_interval[0]) / 2 <= win_precision
+            and (home_interval[1] - home_interval[0]) / 2 <= runs_precision
+            and (away_interval[1] - away_interval[0]) / 2 <= runs_precision
+            )
+        if converged or stats.games >= max_games:
+            break
+
+    return SimpleNamespace(
+        games=stats.games,
+        converged=converged,
+        confidence=confidence,
+        home_win=stats.home_wins / stats.games,
+        home_win_interval=win_interval,
+        expected_home_runs=stats.home.mean,
+        expected_home_runs_interval=home_interval,
+        expected_away_runs=stats.away.mean,
+        expected_away_runs_interval=away_interval,
+        stats=stats,
+        )
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    result = estimate(win_precision=0.01, runs_precision=0.5, seed=42)
+    elapsed = time.perf_counter() - start
+    low, high = result.home_win_interval
+    print(f'{"Converged" if result.converged else "Stopped"} after {result.games:,} games in {elapsed:.2f} seconds')
+    print(f'P(home win) = {result.home_win:.4f}, {result.confidence:.0%} interval {low:.4f} - {high:.4f}')
+    low, high = result.expected_home_runs_interval
+    print(f'Expected home runs = {result.expected_home_runs:.3f}, {result.confidence:.0%} interval {low:.3f} - {high:.3f}')
@@ -0,0 +1,138 @@
+import random
+
+from baseball_6 import HOME, AWAY, OUT
+from baseball_analytic import UNIFORM, check_probs
+from baseball_outcomes import OutcomeSource, SourcedGame, BLOCK_SIZE
+
+"""
+Weighted outcomes - scores with any probabilities, sampled in constant time with an alias table
+
+randint(0, 4) makes an out, single, double, triple and home run equally likely. An alias
+table (Vose's method) lets us draw from any 5 probabilities with one random number, a
+multiply and a comparison, so a realistic model costs no more per pitch than the uniform one.
+
+OutcomeModel gives each team, and optionally each batter, its own probabilities.
+WeightedGame is a game that draws each score from the table for the current batter.
+"""
+
+#----------
+# constants
+#----------
+
+# roughly realistic rates for out, single, double, triple, home run
+REALISTIC = (0.68, 0.21, 0.065, 0.005, 0.04)
+
+#---------------
+# define classes
+#---------------
+
+class AliasTable:
+    def __init__(self, probs):
+        """Build the alias table for 'probs' - one probability for each score."""
+        self.probs = probs = check_probs(probs)
+        n = self.n = len(probs)
+        self.accept = [0.0] * n
+        self.alias = list(range(n))
+
+        scaled = [p * n for p in probs]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.accept[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        for i in small + large:  # any left over are 1.0, apart from rounding errors
+            self.accept[i] = 1.0
+
+    def sample(self, random_number):
+        """Return a score, using one uniform random number in [0, 1)."""
+        u = random_number * self.n
+        i = int(u)
+        return i if u - i < self.accept[i] else self.alias[i]
+
+class AliasSource(OutcomeSource):
+    def __init__(self, probs, seed=None, block_size=BLOCK_SIZE):
+        """An outcome source (see baseball_outcomes) for one set of probabilities."""
+        self.table = AliasTable(probs)
+        self.rng = random.Random(seed)
+        self.block_size = block_size
+        self.block = []
+        self.pos = 0
+
+    def refill(self):
+        sample = self.table.sample
+        random_number = self.rng.random
+        self.block = [sample(random_number()) for _ in range(self.block_size)]
+        self.pos = 0
+
+    def next_score(self):
+        if self.pos == len(self.block):
+            self.refill()
+        score = self.block[self.pos]
+        self.pos += 1
+        return score
+
+class OutcomeModel:
+    def __init__(self, probs=UNIFORM, team_probs=None, batter_probs=None):
+        """Probabilities for each batter.
+
+        probs - used for every batter unless overridden
+        team_probs - {team: probs} for every batter in that team
+        batter_probs - {(team, player): probs} for single batters, e.g. {(HOME, 'D'): REALISTIC}
+        """
+        team_probs = team_probs or {}
+        batter_probs = batter_probs or {}
+        tables = {}  # share one table between batters with the same probabilities
+
+        def get_table(p):
+            p = check_probs(p)
+            if p not in tables:
+                tables[p] = AliasTable(p)
+            return tables[p]
+
+        self.tables = {}
+        for team in (HOME, AWAY):
+            for player in (chr(i+65) for i in range(9)):
+                p = batter_probs.get((team, player), team_probs.get(team, probs))
+                self.tables[team, player] = get_table(p)
+
+class WeightedGame(SourcedGame):
+    def __init__(self, game_id, model, seed=None):
+        """A baseball_6.Game that draws each score from 'model' for the current batter."""
+        super().__init__(game_id, source=None)
+        self.model = model
+        self.random = random.Random(seed).random
+
+    def step(self):
+        score = self.model.tables[self.batting, self.bases[0]].sample(self.random())
+        if score == OUT:
+            self.handle_out()
+        else:
+            self.handle_score(score)
+        return score
+
+if __name__ == '__main__':
+    import time
+    from collections import Counter
+
+    # the alias table reproduces the probabilities
+    source = AliasSource(REALISTIC, seed=42)
+    n = 1_000_000
+    counts = Counter(source.next_score() for _ in range(n))
+    print('Sampled rates:', [round(counts[score] / n, 4) for score in range(5)])
+
+    # a realistic home team against a uniform away team
+    model = OutcomeModel(team_probs={HOME: REALISTIC})
+    games = [WeightedGame(game_id, model, seed=game_id) for game_id in range(1_000)]
+    start = time.perf_counter()
+    for game in games:
+        game.run_game()
+    print(f'Ran {len(games)} games in {time.perf_counter() - start:.2f} seconds')
+    home = sum(game.teams[HOME].score for game in games) / len(games)
+    away = sum(game.teams[AWAY].score for game in games) / len(games)
+    print(f'Average home score is {home:.2f}. Average away score is {away:.2f}.')
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+from baseball_bitmask import TRANSITIONS, END_OF_INNINGS
+
+"""
+Analytic version - work out the exact distribution of scores, without simulating any games
+
+Every batter is the same, so each half-innings is a Markov chain over the 24 states of
+baseball_bitmask (base state and outs). Each step of the chain is one batter.
+
+Every batter either makes an out, scores a run, or is left on base when the innings ends, so -
+    runs = batters - 3 - players left on base
+That means the distribution of runs follows from the distribution of (batters, final bases),
+and the chain only has to track 24 probabilities per batter.
+
+A team's total is the sum of 9 independent half-innings, so its distribution is the
+half-innings distribution convolved with itself 9 times.
+"""
+
+#----------
+# constants
+#----------
+UNIFORM = (0.2, 0.2, 0.2, 0.2, 0.2)  # randint(0, 4) - out, single, double, triple, home run
+TOLERANCE = 1e-15
+
+#----------
+# functions
+#----------
+
+def check_probs(probs):
+    """Return 'probs' as a tuple of 5 probabilities, or raise ValueError."""
+    probs = tuple(float(p) for p in probs)
+    if len(probs) != 5 or min(probs) < 0 or abs(sum(probs) - 1) > 1e-9:
+        raise ValueError(f'Expected 5 probabilities (out, single, double, triple, home run) summing to 1, got {probs}')
+    if probs[0] == 0:
+        raise ValueError('Probability of an out must be greater than 0, else the innings never ends')
+    return probs
+
+def half_innings_runs(probs=UNIFORM, tolerance=TOLERANCE):
+    """Return a list of the probability of scoring 0, 1, 2 ... runs in one half-innings."""
+    probs = check_probs(probs)
+    runs = []
+    current = [0.0] * len(TRANSITIONS)
+    current[0] = 1.0  # no outs, no-one on base
+    batters = 0
+    while sum(current) > tolerance:
+        batters += 1
+        following = [0.0] * len(TRANSITIONS)
+        for state, p_state in enumerate(current):
+            if not p_state:
+                continue
+            for score, p_score in enumerate(probs):
+                new_state, _ = TRANSITIONS[state][score]
+                if new_state == END_OF_INNINGS:
+                    left_on_base = bin(state & 7).count('1')
+                    run_count = batters - 3 - left_on_base
+                    while len(runs) <= run_count:
+                        runs.append(0.0)
+                    runs[run_count] += p_state * p_score
+                else:
+                    following[new_state] += p_state * p_score
+        current = following
+    return trim(runs, tolerance)
+
+def trim(dist, tolerance=TOLERANCE):
+    """Drop negligible probabilities from the end of 'dist'."""
+    end = len(dist)
+    while end > 1 and dist[end-1] < tolerance * 1e-3:
+        end -= 1
+    return dist[:end]
+
+def convolve(a, b):
+    """Return the distribution of the sum of two independent distributions."""
+    result = [0.0] * (len(a) + len(b) - 1)
+    for i, p in enumerate(a):
+        if p:
+            for j, q in enumerate(b):
+                result[i+j] += p * q
+    return trim(result)
+
+def game_runs(probs=UNIFORM, innings=9):
+    """Return a list of the probability of a team scoring 0, 1, 2 ... runs in a game."""
+    half_innings = half_innings_runs(probs)
+    result = [1.0]
+    while innings:  # exponentiation by squaring - 9 innings takes 4 convolutions, not 8
+        if innings & 1:
+            result = convolve(result, half_innings)
+        innings >>= 1
+        if innings:
+            half_innings = convolve(half_innings, half_innings)
+    return result
+
+def expected(dist):
+    """Return the mean of a distribution."""
+    return sum(runs * p for runs, p in enumerate(dist))
+
+def predict(home_probs=UNIFORM, away_probs=None, innings=9):
+    """Return the exact probabilities of a home win, away win and draw, and the expected runs.
+
+    If 'away_probs' is not given, both teams use 'home_probs'.
+    """
+    home = game_runs(home_probs, innings)
+    away = home if away_probs is None else game_runs(away_probs, innings)
+
+    home_win = draw = 0.0
+    away_below = 0.0  # probability that the away team scored less than 'runs'
+    for runs, p_home in enumerate(home):
+        p_away = away[runs] if runs < len(away) else 0.0
+        draw += p_home * p_away
+        home_win += p_home * away_below
+        away_below += p_away
+    away_win = 1.0 - home_win - draw
+
+    return SimpleNamespace(
+        home_win=home_win,
+        away_win=away_win,
+        draw=draw,
+        expected_home_runs=expected(home),
+        expected_away_runs=expected(away),
+        expected_half_innings_runs=expected(half_innings_runs(home_probs)),
+        home_runs=home,
+        away_runs=away,
+        )
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    result = predict()
+    print(f'Elapsed {(time.perf_counter() - start) * 1000:.1f} milliseconds')
+    print(f'P(home win) = {result.home_win:.6f}. P(away win) = {result.away_win:.6f}. P(draw) = {result.draw:.6f}.')
+    print(f'Expected runs per half-innings = {result.expected_half_innings_runs:.4f}. '
+        f'Expected runs per game = {result.expected_home_runs:.4f}.')
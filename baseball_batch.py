@@ -0,0 +1,113 @@
+import numpy as np
+
+from baseball_6 import HOME, AWAY, OUT
+
+"""
+Batch version - keep the state of many games in NumPy arrays, and advance them all together
+
+Instead of a list of players on each base, the bases are stored as a 3-bit mask -
+bit 0 is first base, bit 1 is second base, bit 2 is third base.
+
+A hit of 'score' bases puts the batter on the bases and shifts every runner along -
+    new_mask = ((mask << 1) | 1) << (score - 1)
+Any bits that end up beyond third base are runners who have reached home.
+"""
+
+#----------
+# constants
+#----------
+
+# number of runs for each value of (new_mask >> 3) - the largest possible value is 15, from a home run
+RUNS = np.array([bin(i).count('1') for i in range(16)], dtype=np.int32)
+
+#---------------
+# define classes
+#---------------
+
+class BatchGame:
+    def __init__(self, n_games, seed=None):
+        self.n_games = n_games
+        self.rng = np.random.default_rng(seed)
+        self.bases = np.zeros(n_games, dtype=np.uint8)
+        self.outs = np.zeros(n_games, dtype=np.int8)
+        self.innings_completed = np.zeros((2, n_games), dtype=np.int8)
+        self.score = np.zeros((2, n_games), dtype=np.int32)
+
+        # to start the game, the AWAY team bats first
+        self.batting = np.full(n_games, AWAY, dtype=np.int8)
+
+        # index of every game that is still in progress
+        self.live = np.arange(n_games)
+
+    #--------------------------------------------------
+    # methods required to process each step in the game
+    #--------------------------------------------------
+
+    def game_over(self):
+        """Return True if every game has completed, else False."""
+        return self.live.size == 0
+
+    def step(self):
+        """Draw the next score for every live game, and apply it."""
+        live = self.live
+        score = self.rng.integers(0, 5, size=live.size)
+        is_out = score == OUT
+
+        self.handle_score(live[~is_out], score[~is_out])
+        if self.handle_out(live[is_out]):
+            finished = (
+                (self.innings_completed[HOME, live] == 9)
+                & (self.innings_completed[AWAY, live] == 9)
+                )
+            self.live = live[~finished]
+
+    def handle_score(self, games, score):
+        """Current batter in each of 'games' has scored.
+
+        Move every player on the bases the required number of bases.
+        For each player that returns to home base, add 1 to score.
+        """
+        bases = ((self.bases[games] << 1) | 1) << (score - 1).astype(np.uint8)
+        self.score[self.batting[games], games] += RUNS[bases >> 3]
+        self.bases[games] = bases & 7
+
+    def handle_out(self, games):
+        """Current batter in each of 'games' is out.
+
+        For each game with 3 'outs' this innings, end this innings and start the next.
+        Return True if any innings ended, as that is the only time a game can end.
+        """
+        self.outs[games] += 1
+        changed = games[self.outs[games] == 3]
+        if not changed.size:
+            return False
+        self.outs[changed] = 0
+        self.bases[changed] = 0
+        self.innings_completed[self.batting[changed], changed] += 1
+        self.batting[changed] ^= 1  # if it was HOME, it is now AWAY, and vice-versa
+        return True
+
+    def run_games(self):
+        """Step all games until they are over, then return the home and away scores."""
+        while not self.game_over():
+            self.step()
+        return self.score[HOME], self.score[AWAY]
+
+    def print_results(self):
+        home, away = self.score[HOME], self.score[AWAY]
+        print(f'{self.n_games} games. Average home score is {home.mean():.3f}. Average away score is {away.mean():.3f}.')
+        print(f'Home team won {np.mean(home > away):.2%}. Away team won {np.mean(home < away):.2%}. '
+            f'Result was a draw {np.mean(home == away):.2%}.')
+
+def simulate(n_games, seed=None):
+    """Run 'n_games' games in one batch, and return the home and away scores as arrays."""
+    return BatchGame(n_games, seed).run_games()
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    batch = BatchGame(1_000_000, seed=42)
+    batch.run_games()
+    print(f'Elapsed {time.perf_counter() - start:.2f} seconds')
+    batch.print_results()
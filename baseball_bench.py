@@ -0,0 +1,258 @@
+import importlib.util
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+"""
+Benchmark suite - run every generation of the game headless at a fixed seed, and compare them
+
+For each engine, report pitches/sec, games/sec and peak memory allocated while the games
+are created and run, and for baseball_6 the database insert rate. Timing and memory are
+measured in separate runs, as tracemalloc slows everything down.
+
+To add a new engine, write a setup function that loads any modules for 'n_games' games
+with the given seed, and returns a function that creates and plays the games and returns
+the number of pitches. Add the setup function to ENGINES. Only the returned function is
+timed and traced, so loading and compiling modules is not counted. The returned function
+keeps every game until it finishes, so peak memory includes the state of all the games.
+"""
+
+#----------
+# constants
+#----------
+N_GAMES = 200
+SEED = 42
+
+#-----------------
+# helper functions
+#-----------------
+
+class CountingRandint:
+    """A replacement for randint() that uses its own seeded generator and counts the calls."""
+    def __init__(self, seed):
+        self.randint = random.Random(seed).randint
+        self.calls = 0
+
+    def __call__(self, a, b):
+        self.calls += 1
+        return self.randint(a, b)
+
+def load_module(name):
+    """Load a fresh copy of module 'name', with its own global variables."""
+    spec = importlib.util.find_spec(name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_interleaved(games, randint, out):
+    """The loop from the __main__ block of baseball_5 and baseball_6."""
+    while not all(game.game_over() for game in games):
+        for game in games:
+            if not game.game_over():
+                score = randint(0, 4)
+                if score == out:
+                    game.handle_out()
+                else:
+                    game.handle_score(score)
+
+#--------
+# engines
+#--------
+
+def new_procedural_game(module):
+    """Give a baseball_2 or baseball_3 module a new game, as its global variables are set up on import."""
+    module.teams = [list(range(1, 10)), list(range(1, 10))]
+    module.scores = [
+        SimpleNamespace(score=0, innings_completed=0, outs_this_innings=0),
+        SimpleNamespace(score=0, innings_completed=0, outs_this_innings=0),
+        ]
+    module.bases = [None, None, None, None]
+    module.batting = module.AWAY
+
+def setup_procedural(name, n_games, seed):
+    """baseball_2 and baseball_3 keep the game in global variables, so each game needs a fresh module."""
+    randint = CountingRandint(seed)
+    modules = [load_module(name) for _ in range(n_games)]
+    for module in modules:
+        module.randint = randint
+    def run():
+        for module in modules:
+            new_procedural_game(module)
+            module.run_game()
+        return randint.calls
+    return run
+
+def setup_baseball_2(n_games, seed):
+    return setup_procedural('baseball_2', n_games, seed)
+
+def setup_baseball_3(n_games, seed):
+    return setup_procedural('baseball_3', n_games, seed)
+
+def setup_baseball_4(n_games, seed):
+    module = load_module('baseball_4')
+    module.randint = randint = CountingRandint(seed)
+    def run():
+        games = []
+        for _ in range(n_games):
+            game = module.Game()
+            game.run_game()
+            games.append(game)
+        return randint.calls
+    return run
+
+def setup_interleaved(name, n_games, seed):
+    """baseball_5 and baseball_6 run all the games together, as in their __main__ blocks."""
+    module = load_module(name)
+    randint = CountingRandint(seed)
+    def run():
+        games = [module.Game(game_id) for game_id in range(n_games)]
+        run_interleaved(games, randint, module.OUT)
+        return randint.calls
+    return run
+
+def setup_baseball_5(n_games, seed):
+    return setup_interleaved('baseball_5', n_games, seed)
+
+def setup_baseball_6(n_games, seed):
+    return setup_interleaved('baseball_6', n_games, seed)
+
+def setup_played(game_class, n_games, seed):
+    """Engines with a play(score) method, run one game after another."""
+    randint = CountingRandint(seed)
+    def run():
+        games = []
+        for game_id in range(n_games):
+            game = game_class(game_id)
+            while not game.game_over():
+                game.play(randint(0, 4))
+            games.append(game)
+        return randint.calls
+    return run
+
+def setup_bitmask(n_games, seed):
+    from baseball_bitmask import BitmaskGame
+    return setup_played(BitmaskGame, n_games, seed)
+
+def setup_compact(n_games, seed):
+    from baseball_compact import CompactGame
+    return setup_played(CompactGame, n_games, seed)
+
+def setup_batch(n_games, seed):
+    from baseball_batch import BatchGame
+    def run():
+        batch = BatchGame(n_games, seed)
+        pitches = 0
+        while not batch.game_over():
+            pitches += int(batch.live.size)
+            batch.step()
+        return pitches
+    return run
+
+ENGINES = {
+    'baseball_2': setup_baseball_2,
+    'baseball_3': setup_baseball_3,
+    'baseball_4': setup_baseball_4,
+    'baseball_5': setup_baseball_5,
+    'baseball_6': setup_baseball_6,
+    'bitmask': setup_bitmask,
+    'compact': setup_compact,
+    'batch': setup_batch,
+    }
+
+#-------------
+# measurements
+#-------------
+
+def measure_db_insert_rate(n_games, seed):
+    """Return the rows/sec of baseball_6.Game.update_database(), committed once at the end."""
+    module = load_module('baseball_6')
+    games = [module.Game(game_id) for game_id in range(n_games)]
+    run_interleaved(games, CountingRandint(seed), module.OUT)
+
+    with tempfile.TemporaryDirectory() as path:
+        conn = sqlite3.connect(os.path.join(path, 'baseball_db'))
+        module.setup_database(conn)
+        cur = conn.cursor()
+        start = time.perf_counter()
+        for game in games:
+            game.update_database(cur)
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        conn.close()
+    return n_games / elapsed
+
+def benchmark(name, n_games=N_GAMES, seed=SEED):
+    """Run engine 'name' and return a dict of results."""
+    setup = ENGINES[name]
+
+    run = setup(n_games, seed)
+    start = time.perf_counter()
+    pitches = run()
+    elapsed = time.perf_counter() - start
+
+    run = setup(n_games, seed)  # start again, with the modules loaded and the games created
+    tracemalloc.start()
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        'engine': name,
+        'games': n_games,
+        'seed': seed,
+        'pitches': pitches,
+        'seconds': elapsed,
+        'pitches_per_sec': pitches / elapsed,
+        'games_per_sec': n_games / elapsed,
+        'peak_memory_bytes': peak_memory,
+        }
+    if name == 'baseball_6':
+        result['db_rows_per_sec'] = measure_db_insert_rate(n_games, seed)
+    return result
+
+def run_benchmarks(names=None, n_games=N_GAMES, seed=SEED, output=None):
+    """Benchmark each engine in 'names' (default all), and write the results to 'output' as JSON."""
+    results = []
+    for name in names or ENGINES:
+        try:
+            results.append(benchmark(name, n_games, seed))
+        except ImportError as e:  # e.g. numpy is not installed for the batch engine
+            results.append({'engine': name, 'skipped': str(e)})
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+def print_benchmarks(results):
+    for result in results:
+        if 'skipped' in result:
+            print(f'{result["engine"]:<12} skipped - {result["skipped"]}')
+            continue
+        line = (
+            f'{result["engine"]:<12} {result["pitches_per_sec"]:>12,.0f} pitches/sec'
+            f' {result["games_per_sec"]:>10,.0f} games/sec'
+            f' {result["peak_memory_bytes"] / 1024:>10,.0f} KiB peak'
+            )
+        if 'db_rows_per_sec' in result:
+            line += f' {result["db_rows_per_sec"]:>10,.0f} db rows/sec'
+        print(line)
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark every baseball engine')
+    parser.add_argument('engines', nargs='*', help=f'engines to run (default all of {", ".join(ENGINES)})')
+    parser.add_argument('--games', type=int, default=N_GAMES)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--output', help='write the results to this file as JSON')
+    args = parser.parse_args()
+    unknown = [name for name in args.engines if name not in ENGINES]
+    if unknown:
+        parser.error(f'unknown engine {", ".join(unknown)} (choose from {", ".join(ENGINES)})')
+
+    print_benchmarks(run_benchmarks(args.engines, args.games, args.seed, args.output))
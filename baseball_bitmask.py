@@ -0,0 +1,109 @@
+from random import randint
+
+from baseball_6 import HOME, AWAY, OUT
+
+"""
+Bitmask version - replace the list of bases with a small integer, and each pitch with a table lookup
+
+The state of a half-innings is held in one integer -
+    bits 0-2 are the bases (bit 0 is first base, bit 1 is second base, bit 2 is third base)
+    bits 3-4 are the number of outs this innings (0-2)
+That gives 24 possible states. For each state and each score, the new state and the
+number of runs scored are worked out once, when the module is imported.
+"""
+
+#----------
+# constants
+#----------
+N_STATES = 24  # 8 base states * 3 outs
+END_OF_INNINGS = -1
+
+#---------------------------------
+# build the state transition table
+#---------------------------------
+
+def transition(state, score):
+    """Return (new_state, runs) for 'score' in 'state'.
+
+    If this is the third 'out' this innings, new_state is END_OF_INNINGS.
+    """
+    bases, outs = state & 7, state >> 3
+    if score == OUT:
+        if outs == 2:
+            return END_OF_INNINGS, 0
+        return bases | (outs + 1) << 3, 0
+    # put the batter on the bases, and move every player along by 'score' bases
+    bases = ((bases << 1) | 1) << (score - 1)
+    runs = bin(bases >> 3).count('1')  # players that have returned to home base
+    return (bases & 7) | outs << 3, runs
+
+# TRANSITIONS[state][score] -> (new_state, runs)
+TRANSITIONS = tuple(
+    tuple(transition(state, score) for score in range(5))
+    for state in range(N_STATES)
+    )
+
+#---------------
+# define classes
+#---------------
+
+class BitmaskGame:
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.scores = [0, 0]
+        self.innings_completed = [0, 0]
+        self.state = 0
+
+        # to start the game, the AWAY team bats first
+        self.batting = AWAY
+
+    def game_over(self):
+        """Return True if both teams have completed 9 innings, else False."""
+        return self.innings_completed[HOME] == 9 and self.innings_completed[AWAY] == 9
+
+    def play(self, score):
+        """Apply the next score to the game."""
+        state, runs = TRANSITIONS[self.state][score]
+        if state == END_OF_INNINGS:  # change innings
+            self.innings_completed[self.batting] += 1
+            self.batting ^= 1  # if it was HOME, it is now AWAY, and vice-versa
+            state = 0
+        else:
+            self.scores[self.batting] += runs
+        self.state = state
+
+    # the same interface as baseball_6.Game, so the two can be driven by the same loop
+    def handle_out(self):
+        self.play(OUT)
+
+    def handle_score(self, score):
+        self.play(score)
+
+    def print_results(self):
+        print(f'Home score is {self.scores[HOME]}. Away score is {self.scores[AWAY]}.')
+
+        if self.scores[HOME] > self.scores[AWAY]:
+            print('Home team won')
+        elif self.scores[HOME] < self.scores[AWAY]:
+            print('Away team won')
+        else:
+            print('Result is a draw')
+
+if __name__ == '__main__':
+    from baseball_6 import Game
+
+    # drive a Game and a BitmaskGame with the same sequence of scores, and check they agree
+    for game_id in range(1000):
+        game = Game(game_id)
+        bitmask_game = BitmaskGame(game_id)
+        while not game.game_over():
+            score = randint(0, 4)
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+            bitmask_game.play(score)
+        assert bitmask_game.game_over()
+        assert bitmask_game.scores == [game.teams[HOME].score, game.teams[AWAY].score]
+
+    bitmask_game.print_results()
@@ -0,0 +1,128 @@
+import time
+
+from baseball_6 import HOME, AWAY
+
+"""
+Bulk database writer - insert scores in batches with executemany, and commit periodically
+
+Game.update_database() runs one INSERT per game, and the whole run is committed at the end.
+BulkWriter collects rows into batches, inserts each batch with one executemany() call,
+and commits every 'commit_every' rows, so a long run does not have to be all-or-nothing.
+
+The scores table is the one created by baseball_6.setup_database().
+"""
+
+#----------
+# constants
+#----------
+INSERT_SQL = """
+    INSERT INTO scores (game_id, home_team_score, away_team_score)
+    VALUES (?, ?, ?)
+    """
+
+#---------------
+# define classes
+#---------------
+
+class BulkWriter:
+    def __init__(self, conn, batch_size=10_000, commit_every=100_000,
+            wal=False, synchronous=None, report_every=None, report=print):
+        """Write rows of (game_id, home_team_score, away_team_score) to the scores table.
+
+        wal - if True, switch the database to write-ahead logging
+        synchronous - if given, set PRAGMA synchronous, e.g. 'OFF' or 'NORMAL'
+        report_every - if given, call report() with a progress message every 'report_every' rows
+        """
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.report_every = report_every
+        self.report = report
+
+        if wal:
+            self.cur.execute('PRAGMA journal_mode=WAL')
+        if synchronous is not None:
+            self.cur.execute(f'PRAGMA synchronous={synchronous}')
+
+        self.batch = []
+        self.rows_written = 0
+        self.rows_committed = 0
+        self.next_report = report_every
+        self.start = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.conn.rollback()
+
+    #------------------------
+    # methods to add new rows
+    #------------------------
+
+    def write(self, game_id, home_team_score, away_team_score):
+        """Add one row, and insert the batch when it is full."""
+        self.batch.append((game_id, home_team_score, away_team_score))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def write_game(self, game):
+        """Add the scores of a finished baseball_6.Game."""
+        self.write(game.game_id, game.teams[HOME].score, game.teams[AWAY].score)
+
+    def write_scores(self, home_scores, away_scores, first_game_id=0):
+        """Add the scores returned by one of the batch or multi-process runners."""
+        for game_id, home, away in zip(range(first_game_id, first_game_id + len(home_scores)), home_scores, away_scores):
+            self.write(game_id, int(home), int(away))
+
+    #---------------------------------
+    # methods to write to the database
+    #---------------------------------
+
+    def flush(self):
+        """Insert the current batch, and commit if 'commit_every' rows have been inserted."""
+        if self.batch:
+            self.cur.executemany(INSERT_SQL, self.batch)
+            self.rows_written += len(self.batch)
+            self.batch = []
+        if self.rows_written - self.rows_committed >= self.commit_every:
+            self.commit()
+        if self.next_report is not None and self.rows_written >= self.next_report:
+            self.report(f'{self.rows_written:,} rows, {self.rows_per_second():,.0f} rows/sec')
+            while self.next_report <= self.rows_written:
+                self.next_report += self.report_every
+
+    def commit(self):
+        self.conn.commit()
+        self.rows_committed = self.rows_written
+
+    def close(self):
+        """Insert any remaining rows and commit."""
+        self.flush()
+        self.commit()
+
+    def rows_per_second(self):
+        elapsed = time.perf_counter() - self.start
+        return self.rows_written / elapsed if elapsed else 0.0
+
+if __name__ == '__main__':
+    import os
+    import random
+    import sqlite3
+
+    from baseball_6 import setup_database
+
+    path = os.path.dirname(os.path.abspath(__file__))
+    conn = sqlite3.connect(os.path.join(path, 'baseball_db'))
+    setup_database(conn)
+
+    n_games = 1_000_000
+    with BulkWriter(conn, wal=True, synchronous='OFF', report_every=250_000) as writer:
+        for game_id in range(n_games):
+            writer.write(game_id, random.randint(50, 150), random.randint(50, 150))
+    print(f'Wrote {writer.rows_written:,} rows at {writer.rows_per_second():,.0f} rows/sec')
+    conn.close()
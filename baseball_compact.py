@@ -0,0 +1,183 @@
+from array import array
+from random import randint
+
+from baseball_6 import HOME, AWAY, OUT
+from baseball_bitmask import TRANSITIONS, END_OF_INNINGS
+
+"""
+Compact version - a small, fixed set of fields per game, for holding a very large number of games
+
+baseball_6.Game holds two Team objects, each with its own __dict__ and lineup list, and moves
+batters between the lineup and the bases on every pitch. Here -
+    the game is a single object with __slots__ and no __dict__
+    the bases and outs are one integer state from baseball_bitmask
+    each team's batting order is a cursor from 0 to 8 - the next batter is the cursor,
+        and the cursor moves on by one for every batter (modulo 9)
+
+For a million or more games in progress, GameArray goes further and holds the same fields
+for every game in preallocated arrays, about 14 bytes per game.
+
+Note that baseball_6.Game returns players to the end of the lineup in the order they leave
+the field, so its batting order can drift. The scores are the same either way, as every
+player is identical.
+"""
+
+#----------
+# constants
+#----------
+LINEUP = [chr(i+65) for i in range(9)]  # the same players as baseball_6.Team
+
+#---------------
+# define classes
+#---------------
+
+class CompactGame:
+    __slots__ = (
+        'game_id', 'state', 'batting',
+        'home_score', 'away_score',
+        'home_innings', 'away_innings',
+        'home_batter', 'away_batter',
+        )
+
+    def __init__(self, game_id):
+        self.game_id = game_id
+        self.state = 0
+        self.home_score = self.away_score = 0
+        self.home_innings = self.away_innings = 0
+        self.home_batter = self.away_batter = 0
+
+        # to start the game, the AWAY team bats first
+        self.batting = AWAY
+
+    def game_over(self):
+        """Return True if both teams have completed 9 innings, else False."""
+        return self.home_innings == 9 and self.away_innings == 9
+
+    def get_batter(self):
+        """Return the player currently batting."""
+        if self.batting == HOME:
+            return LINEUP[self.home_batter]
+        return LINEUP[self.away_batter]
+
+    def play(self, score):
+        """Apply the next score to the game, and move on to the next batter."""
+        state, runs = TRANSITIONS[self.state][score]
+        if self.batting == HOME:
+            self.home_batter = (self.home_batter + 1) % 9
+            if state == END_OF_INNINGS:
+                self.home_innings += 1
+                self.batting = AWAY
+                state = 0
+            else:
+                self.home_score += runs
+        else:
+            self.away_batter = (self.away_batter + 1) % 9
+            if state == END_OF_INNINGS:
+                self.away_innings += 1
+                self.batting = HOME
+                state = 0
+            else:
+                self.away_score += runs
+        self.state = state
+
+    # the same interface as baseball_6.Game, so the two can be driven by the same loop
+    def handle_out(self):
+        self.play(OUT)
+
+    def handle_score(self, score):
+        self.play(score)
+
+    def print_results(self):
+        print(f'Home score is {self.home_score}. Away score is {self.away_score}.')
+
+        if self.home_score > self.away_score:
+            print('Home team won')
+        elif self.home_score < self.away_score:
+            print('Away team won')
+        else:
+            print('Result is a draw')
+
+class GameArray:
+    def __init__(self, n_games):
+        """Hold the state of 'n_games' games, numbered 0 to n_games-1.
+
+        The per-team fields are stored as [game * 2 + team].
+        """
+        self.n_games = n_games
+        self.state = array('b', bytes(n_games))
+        self.batting = array('b', [AWAY]) * n_games
+        self.innings = array('b', bytes(n_games * 2))
+        self.batter = array('b', bytes(n_games * 2))
+        self.scores = array('i', bytes(n_games * 2 * array('i').itemsize))
+
+    def game_over(self, game):
+        """Return True if both teams have completed 9 innings, else False."""
+        return self.innings[game*2 + HOME] == 9 and self.innings[game*2 + AWAY] == 9
+
+    def play(self, game, score):
+        """Apply the next score to 'game', and move on to the next batter."""
+        team = game*2 + self.batting[game]
+        state, runs = TRANSITIONS[self.state[game]][score]
+        self.batter[team] = (self.batter[team] + 1) % 9
+        if state == END_OF_INNINGS:
+            self.innings[team] += 1
+            self.batting[game] ^= 1  # if it was HOME, it is now AWAY, and vice-versa
+            state = 0
+        else:
+            self.scores[team] += runs
+        self.state[game] = state
+
+    def get_scores(self, game):
+        """Return (home_score, away_score) for 'game'."""
+        return self.scores[game*2 + HOME], self.scores[game*2 + AWAY]
+
+#-----------------
+# memory benchmark
+#-----------------
+
+def memory_per_game(game_class, n_games=100_000, pitches=20):
+    """Return the average number of bytes allocated per game in progress.
+
+    Each game is given a few pitches first, so that it is measured part-way through.
+    """
+    import tracemalloc
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = []
+    for game_id in range(n_games):
+        game = game_class(game_id)
+        for _ in range(pitches):
+            score = randint(0, 4)
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+        games.append(game)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_games
+
+def memory_per_game_array(n_games=100_000, pitches=20):
+    """Return the average number of bytes allocated per game in progress in a GameArray."""
+    import tracemalloc
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    games = GameArray(n_games)
+    for game in range(n_games):
+        for _ in range(pitches):
+            games.play(game, randint(0, 4))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n_games
+
+if __name__ == '__main__':
+    from baseball_6 import Game
+
+    game_bytes = memory_per_game(Game)
+    compact_bytes = memory_per_game(CompactGame)
+    array_bytes = memory_per_game_array()
+    print(f'baseball_6.Game: {game_bytes:,.0f} bytes per game')
+    print(f'CompactGame:     {compact_bytes:,.0f} bytes per game ({game_bytes / compact_bytes:.1f}x smaller)')
+    print(f'GameArray:       {array_bytes:,.0f} bytes per game ({game_bytes / array_bytes:.1f}x smaller)')
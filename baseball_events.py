@@ -0,0 +1,93 @@
+from typing import NamedTuple
+
+from baseball_6 import HOME, AWAY, OUT
+from baseball_outcomes import SourcedGame
+
+"""
+Event iterator - watch a game as a stream of pitch events, without reading its internal state
+
+EventGame.events() is a generator. Each time it is asked for the next event, it plays one
+pitch and yields an immutable PitchEvent describing it. Nothing is played in advance and
+nothing is buffered, so the events can be filtered, tee'd or streamed lazily, e.g.
+
+    home_runs = (event for event in game.events() if event.outcome == 4)
+"""
+
+#----------
+# constants
+#----------
+HOME_BASE = 4  # 'to_base' for a player who has scored
+
+#---------------
+# define classes
+#---------------
+
+class PitchEvent(NamedTuple):
+    game_id: int
+    pitch: int  # 1 for the first pitch of the game
+    batting: int  # HOME or AWAY
+    innings: int  # the innings being played, from 1 to 9
+    batter: str
+    outcome: int  # 0 for out, 1-4 for the number of bases
+    runners_moved: tuple  # (player, from_base, to_base) - the batter moves from base 0
+    runs_scored: int
+    outs: int  # outs this innings after the pitch - 3 means the innings has ended
+    home_score: int
+    away_score: int
+
+class EventGame(SourcedGame):
+    def events(self):
+        """Play the rest of the game, yielding a PitchEvent for each pitch."""
+        pitch = 0
+        while not self.game_over():
+            pitch += 1
+            batting = int(self.batting)  # Game switches sides with 'not', so this may be a bool
+            team = self.teams[batting]
+            innings = team.innings_completed + 1
+            outs = team.outs_this_innings
+            score_before = team.score
+            bases = tuple(self.bases)
+
+            outcome = self.step()
+
+            if outcome == OUT:
+                runners_moved = ()
+                outs += 1
+            else:
+                runners_moved = tuple(
+                    (bases[base], base, min(base + outcome, HOME_BASE))
+                    for base in (3, 2, 1, 0)
+                    if bases[base] is not None
+                    )
+            yield PitchEvent(
+                game_id=self.game_id,
+                pitch=pitch,
+                batting=batting,
+                innings=innings,
+                batter=bases[0],
+                outcome=outcome,
+                runners_moved=runners_moved,
+                runs_scored=team.score - score_before,
+                outs=outs,
+                home_score=self.teams[HOME].score,
+                away_score=self.teams[AWAY].score,
+                )
+
+if __name__ == '__main__':
+    import itertools
+
+    from baseball_outcomes import SeededSource
+
+    game = EventGame(0, SeededSource(42))
+    events = game.events()
+
+    # print the first few pitches
+    for event in itertools.islice(events, 8):
+        print(event)
+
+    # then only the pitches that scored runs, in the ninth innings
+    for event in events:
+        if event.innings == 9 and event.runs_scored:
+            team = 'Home' if event.batting == HOME else 'Away'
+            print(f'{team} {event.batter} scores {event.runs_scored} - {event.home_score}:{event.away_score}')
+    game.print_results()
@@ -0,0 +1,97 @@
+import itertools
+import json
+import os
+import random
+from array import array
+
+from baseball_analytic import UNIFORM, check_probs, half_innings_runs
+
+"""
+Half-innings sampling - build the distribution of runs in a half-innings once, then make up games from it
+
+Every half-innings starts with no-one on base and no outs, and is independent of every other
+half-innings. The only thing carried over is the position in the lineup, and as every batter
+is identical that makes no difference to the runs. So one distribution covers every
+half-innings, whoever leads off.
+
+The distribution is worked out exactly by baseball_analytic, and saved to a JSON file so it
+can be reused by later runs. A game is then 9 samples for the away team and 9 for the home
+team, instead of several hundred pitches.
+"""
+
+#----------
+# constants
+#----------
+CACHE_FILE = 'baseball_innings.json'
+INNINGS = 9
+
+#---------------
+# define classes
+#---------------
+
+class InningsSampler:
+    def __init__(self, probs=UNIFORM, cache_path=None, seed=None):
+        """Sample games from the runs-per-half-innings distribution for 'probs'.
+
+        cache_path - JSON file for the distributions. By default, CACHE_FILE in the same
+            directory as the program.
+        """
+        self.probs = check_probs(probs)
+        if cache_path is None:
+            cache_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_FILE)
+        self.cache_path = cache_path
+        self.distribution = self.load_distribution()
+        self.cum_weights = list(itertools.accumulate(self.distribution))
+        self.runs = range(len(self.distribution))
+        self.rng = random.Random(seed)
+
+    def load_distribution(self):
+        """Return the distribution for self.probs, from the cache if it is there, else build and save it."""
+        key = ','.join(repr(p) for p in self.probs)
+        cache = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path) as f:
+                cache = json.load(f)
+            if key in cache:
+                return cache[key]
+
+        cache[key] = distribution = half_innings_runs(self.probs)
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, self.cache_path)  # so a half-written file is never read
+        return distribution
+
+    def play_game(self):
+        """Return (home_score, away_score) for one game."""
+        runs = self.rng.choices(self.runs, cum_weights=self.cum_weights, k=INNINGS * 2)
+        return sum(runs[INNINGS:]), sum(runs[:INNINGS])
+
+    def team_scores(self, n_scores):
+        """Return the scores of one team in 'n_scores' games, as an array."""
+        runs = self.rng.choices(self.runs, cum_weights=self.cum_weights, k=n_scores * INNINGS)
+        return array('i', map(sum, zip(*[iter(runs)] * INNINGS)))  # add up each group of 9
+
+    def simulate(self, n_games):
+        """Return the home and away scores of 'n_games' games, as arrays."""
+        totals = self.team_scores(n_games * 2)
+        return totals[1::2], totals[0::2]
+
+if __name__ == '__main__':
+    import time
+
+    sampler = InningsSampler(seed=42)
+    expected = sum(runs * p for runs, p in enumerate(sampler.distribution))
+    print(f'Expected runs per half-innings = {expected:.4f}')
+
+    n_games = 1_000_000
+    start = time.perf_counter()
+    home_scores, away_scores = sampler.simulate(n_games)
+    elapsed = time.perf_counter() - start
+
+    home_wins = sum(home > away for home, away in zip(home_scores, away_scores))
+    away_wins = sum(home < away for home, away in zip(home_scores, away_scores))
+    print(f'{n_games:,} games in {elapsed:.2f} seconds ({n_games / elapsed:,.0f} games/sec)')
+    print(f'Average home score is {sum(home_scores) / n_games:.3f}. Average away score is {sum(away_scores) / n_games:.3f}.')
+    print(f'Home team won {home_wins / n_games:.2%}. Away team won {away_wins / n_games:.2%}. '
+        f'Result was a draw {(n_games - home_wins - away_wins) / n_games:.2%}.')
@@ -0,0 +1,227 @@
+import asyncio
+import random
+from typing import NamedTuple
+
+from baseball_6 import Game, HOME, AWAY, OUT
+
+"""
+Live feeds - drive games from play-by-play feeds with asyncio, instead of randint
+
+A feed is a stream of text lines, one per pitch -
+    <game_id> <score>
+where score is 0 for an out, or 1-4 for the number of bases. One feed can carry any number
+of games, and the hub can follow any number of feeds at once - over unix sockets, TCP or
+pipes. Each message is applied to the right Game by game_id, and a ScoreUpdate is pushed
+to every subscriber.
+
+Each feed is read in its own task, so a slow feed does not hold up any other. A feed that
+sends nothing for 'idle_timeout' seconds is closed. A subscriber that does not keep up has
+its oldest updates dropped, rather than slowing down the feeds.
+
+start_feed_server() is a stand-in for a real feed, for testing.
+"""
+
+#----------
+# constants
+#----------
+IDLE_TIMEOUT = 30.0
+QUEUE_SIZE = 10_000
+YIELD_EVERY = 100  # lines read from a feed before other tasks get a turn
+
+#---------------
+# define classes
+#---------------
+
+class ScoreUpdate(NamedTuple):
+    game_id: int
+    home_score: int
+    away_score: int
+    game_over: bool
+
+class LiveHub:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, queue_size=QUEUE_SIZE):
+        self.idle_timeout = idle_timeout
+        self.queue_size = queue_size
+        self.games = {}
+        self.subscribers = []
+        self.messages = 0
+        self.errors = 0
+        self.dropped_updates = 0
+        self.timed_out_feeds = []
+
+    def subscribe(self):
+        """Return a queue that receives a ScoreUpdate after every pitch."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.append(queue)
+        return queue
+
+    def apply(self, game_id, score):
+        """Apply one score to game 'game_id', creating the game on its first message."""
+        game = self.games.get(game_id)
+        if game is None:
+            game = self.games[game_id] = Game(game_id)
+        if game.game_over():
+            raise ValueError(f'Game {game_id} is already over')
+        if score == OUT:
+            game.handle_out()
+        else:
+            game.handle_score(score)
+
+        update = ScoreUpdate(game_id, game.teams[HOME].score, game.teams[AWAY].score, game.game_over())
+        for queue in self.subscribers:
+            if queue.full():  # a slow subscriber loses its oldest update
+                queue.get_nowait()
+                self.dropped_updates += 1
+            queue.put_nowait(update)
+        return update
+
+    def handle_line(self, line):
+        """Apply one 'game_id score' message, as bytes or str. A bad message is counted in self.errors."""
+        try:
+            if isinstance(line, bytes):
+                line = line.decode()  # UnicodeDecodeError is a ValueError
+            game_id, score = line.split()
+            score = int(score)
+            if not 0 <= score <= 4:
+                raise ValueError(f'Invalid score {score}')
+            self.apply(int(game_id), score)
+        except ValueError:
+            self.errors += 1
+        else:
+            self.messages += 1
+
+    #----------------------------------
+    # reading feeds - one task per feed
+    #----------------------------------
+
+    async def read_feed(self, reader, name='feed'):
+        """Read lines from 'reader' until it closes, or is silent for idle_timeout seconds."""
+        loop = asyncio.get_running_loop()
+        lines = 0
+        try:
+            # one timeout for the whole feed, pushed back after every line, rather than a new
+            # task per line as asyncio.wait_for() would create
+            async with asyncio.timeout(self.idle_timeout) as idle:
+                while True:
+                    try:
+                        line = await reader.readline()
+                    except ValueError:  # the line was longer than the reader's limit, and has been discarded
+                        self.errors += 1
+                        continue
+                    if not line:  # end of feed
+                        return
+                    if self.idle_timeout is not None:
+                        idle.reschedule(loop.time() + self.idle_timeout)
+                    self.handle_line(line)
+                    lines += 1
+                    if lines % YIELD_EVERY == 0:  # readline() does not give way while lines are buffered
+                        await asyncio.sleep(0)
+        except TimeoutError:
+            self.timed_out_feeds.append(name)
+
+    async def follow_unix(self, path):
+        reader, writer = await asyncio.open_unix_connection(path)
+        try:
+            await self.read_feed(reader, path)
+        finally:
+            writer.close()
+
+    async def follow_tcp(self, host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await self.read_feed(reader, f'{host}:{port}')
+        finally:
+            writer.close()
+
+    async def follow_pipe(self, pipe):
+        """Read a feed from a pipe or other file object opened in binary mode."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        try:
+            await self.read_feed(reader, getattr(pipe, 'name', 'pipe'))
+        finally:
+            transport.close()
+
+#---------------------------
+# stand-in feed, for testing
+#---------------------------
+
+async def start_feed_server(path, game_ids, seed=None, delay=0.0, silent=False):
+    """Start a unix socket server that sends random pitches for 'game_ids' until they are all over.
+
+    delay - seconds to wait between rounds of pitches
+    silent - if True, accept connections but never send anything
+    """
+    async def send_feed(reader, writer):
+        if silent:
+            await reader.read()  # wait for the client to give up
+            writer.close()
+            return
+        randint = random.Random(seed).randint
+        games = [Game(game_id) for game_id in game_ids]
+        while games:
+            lines = []
+            for game in games:
+                score = randint(0, 4)
+                if score == OUT:
+                    game.handle_out()
+                else:
+                    game.handle_score(score)
+                lines.append(f'{game.game_id} {score}\n')
+            writer.write(''.join(lines).encode())
+            await writer.drain()
+            games = [game for game in games if not game.game_over()]
+            if delay:
+                await asyncio.sleep(delay)
+        writer.close()
+        await writer.wait_closed()
+
+    return await asyncio.start_unix_server(send_feed, path)
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+
+    async def main():
+        directory = tempfile.mkdtemp()
+        hub = LiveHub(idle_timeout=1.0)
+        updates = hub.subscribe()
+
+        servers = []
+        paths = []
+        for feed in range(4):
+            path = os.path.join(directory, f'feed_{feed}.sock')
+            game_ids = range(feed * 1_000, (feed + 1) * 1_000)
+            servers.append(await start_feed_server(path, game_ids, seed=feed))
+            paths.append(path)
+        silent_path = os.path.join(directory, 'silent.sock')
+        servers.append(await start_feed_server(silent_path, [], silent=True))
+        paths.append(silent_path)
+
+        finished = []
+
+        async def watch():
+            while True:
+                update = await updates.get()
+                if update.game_over:
+                    finished.append(update.game_id)
+
+        start = time.perf_counter()
+        watcher = asyncio.create_task(watch())
+        await asyncio.gather(*(hub.follow_unix(path) for path in paths))
+        while not updates.empty():  # let the subscriber catch up
+            await asyncio.sleep(0)
+        watcher.cancel()
+        elapsed = time.perf_counter() - start
+
+        for server in servers:
+            server.close()
+        print(f'{hub.messages:,} messages for {len(finished):,} games in {elapsed:.2f} seconds '
+            f'({hub.messages / elapsed:,.0f} messages/sec)')
+        print(f'Errors: {hub.errors}. Dropped updates: {hub.dropped_updates}. '
+            f'Timed out feeds: {[os.path.basename(name) for name in hub.timed_out_feeds]}')
+        hub.games[0].print_results()
+
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+import mmap
+import os
+from array import array
+
+from baseball_6 import Game, OUT
+
+"""
+Play-by-play log - record every score a game uses, so any game can be replayed later
+
+Each score (0-4) is stored as one byte. The scores for a game are kept in memory while the
+game is in progress, and appended to the log file as one block when the game is over.
+
+Alongside the log file is an index file of (game_id, offset, length) for every game, stored
+as 64-bit integers. The reader memory-maps the log file, so a game's scores are read
+directly from the file without copying it into memory.
+"""
+
+#----------
+# constants
+#----------
+INDEX_SUFFIX = '.idx'
+SCAN_CHUNK = 1 << 20  # 1 MiB
+
+#---------------
+# define classes
+#---------------
+
+class EventLog:
+    def __init__(self, path):
+        """Open the log file at 'path' for appending. The index is written to path + '.idx'."""
+        self.path = path
+        self.log_file = open(path, 'ab')
+        self.index_file = open(path + INDEX_SUFFIX, 'ab')
+        self.offset = self.log_file.tell()
+        self.in_progress = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record(self, game_id, score):
+        """Record the next score for 'game_id'."""
+        buffer = self.in_progress.get(game_id)
+        if buffer is None:
+            buffer = self.in_progress[game_id] = bytearray()
+        buffer.append(score)
+
+    def end_game(self, game_id):
+        """Append the scores for 'game_id' to the log, and add it to the index."""
+        buffer = self.in_progress.pop(game_id)
+        self.log_file.write(buffer)
+        self.index_file.write(array('q', (game_id, self.offset, len(buffer))).tobytes())
+        self.offset += len(buffer)
+
+    def close(self):
+        self.log_file.close()
+        self.index_file.close()
+
+class RecordingGame(Game):
+    def __init__(self, game_id, log):
+        """A baseball_6.Game that records every score it uses in 'log'."""
+        super().__init__(game_id)
+        self.log = log
+
+    def handle_out(self):
+        self.log.record(self.game_id, OUT)
+        super().handle_out()
+        if self.game_over():  # a game can only end on an out
+            self.log.end_game(self.game_id)
+
+    def handle_score(self, score):
+        self.log.record(self.game_id, score)
+        super().handle_score(score)
+
+class LogReader:
+    def __init__(self, path):
+        """Open the log file at 'path' for reading."""
+        self.path = path
+        self.index = {}
+        index = array('q')
+        with open(path + INDEX_SUFFIX, 'rb') as index_file:
+            index.frombytes(index_file.read())
+        for pos in range(0, len(index), 3):
+            game_id, offset, length = index[pos:pos+3]
+            self.index[game_id] = (offset, length)
+
+        self.log_file = open(path, 'rb')
+        if os.fstat(self.log_file.fileno()).st_size:
+            self.log = mmap.mmap(self.log_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:  # an empty file cannot be memory-mapped
+            self.log = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if isinstance(self.log, mmap.mmap):
+            try:
+                self.log.close()
+            except BufferError:  # a caller still holds a view from scores() - the map is freed with it
+                pass
+        self.log_file.close()
+
+    def game_ids(self):
+        return self.index.keys()
+
+    def scores(self, game_id):
+        """Return the scores for 'game_id' as a memoryview of the log - no copy is made.
+
+        Release the view, or use bytes(view) to keep a copy, before the reader is closed.
+        Otherwise the memory map stays open until the view is garbage collected.
+        """
+        offset, length = self.index[game_id]
+        return memoryview(self.log)[offset:offset+length]
+
+    def replay(self, game_id, pitches=None):
+        """Rebuild 'game_id' as a baseball_6.Game, as it was after 'pitches' pitches.
+
+        If 'pitches' is None, replay the whole game.
+        """
+        game = Game(game_id)
+        scores = self.scores(game_id)
+        if pitches is not None:
+            scores = scores[:pitches]
+        for score in scores:
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+        return game
+
+    #------------------------------------------
+    # aggregate queries over the whole log file
+    #------------------------------------------
+
+    def scan(self, chunk_size=SCAN_CHUNK):
+        """Yield the whole log in chunks of 'chunk_size' bytes."""
+        for start in range(0, len(self.log), chunk_size):
+            yield self.log[start:start+chunk_size]
+
+    def score_counts(self):
+        """Return the number of times each score (0-4) appears in the log."""
+        counts = [0] * 5
+        targets = [bytes([score]) for score in range(5)]
+        for chunk in self.scan():
+            for score, target in enumerate(targets):
+                counts[score] += chunk.count(target)
+        return counts
+
+    def pitches_per_game(self):
+        """Return the number of pitches in each game, as {game_id: pitches}."""
+        return {game_id: length for game_id, (offset, length) in self.index.items()}
+
+if __name__ == '__main__':
+    import tempfile
+    from random import randint
+
+    path = os.path.join(tempfile.mkdtemp(), 'baseball_log')
+
+    games = []
+    with EventLog(path) as log:
+        for game_id in range(1000):
+            games.append(RecordingGame(game_id, log))
+        while not all(game.game_over() for game in games):
+            for game in games:
+                if not game.game_over():
+                    score = randint(0, 4)
+                    if score == OUT:
+                        game.handle_out()
+                    else:
+                        game.handle_score(score)
+
+    with LogReader(path) as reader:
+        for game in games:
+            replayed = reader.replay(game.game_id)
+            assert [team.score for team in replayed.teams] == [team.score for team in game.teams]
+        print(f'Replayed {len(games)} games')
+        print(f'Score counts (out, single, double, triple, home run): {reader.score_counts()}')
+        reader.replay(0, pitches=50).print_results()
@@ -0,0 +1,125 @@
+import random
+from abc import ABC, abstractmethod
+
+from baseball_6 import Game, OUT
+
+"""
+Outcome sources - where a game gets its next score from
+
+Every source has a next_score() method that returns the next score (0-4).
+    BlockRandomSource - generates a block of thousands of scores at a time, and hands them out one by one
+    SeededSource - calls randint(0, 4) on its own seeded generator, so it gives the same
+        sequence as random.seed(seed) followed by the randint() loop in baseball_6
+    ReplaySource - hands out a recorded sequence of scores, e.g. from baseball_log.LogReader
+
+SourcedGame is a baseball_6.Game that draws its scores from a source.
+"""
+
+#----------
+# constants
+#----------
+SCORES = range(5)  # out, single, double, triple, home run
+BLOCK_SIZE = 4096
+
+#---------------
+# define classes
+#---------------
+
+class OutcomeSource(ABC):
+    @abstractmethod
+    def next_score(self):
+        """Return the next score (0-4)."""
+
+class BlockRandomSource(OutcomeSource):
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        self.rng = random.Random(seed)
+        self.block_size = block_size
+        self.block = []
+        self.pos = 0
+
+    def refill(self):
+        self.block = self.rng.choices(SCORES, k=self.block_size)
+        self.pos = 0
+
+    def next_score(self):
+        if self.pos == len(self.block):
+            self.refill()
+        score = self.block[self.pos]
+        self.pos += 1
+        return score
+
+class SeededSource(OutcomeSource):
+    def __init__(self, seed):
+        self.seed = seed
+        self.randint = random.Random(seed).randint
+
+    def next_score(self):
+        return self.randint(0, 4)
+
+class ReplaySource(OutcomeSource):
+    def __init__(self, scores):
+        """Hand out 'scores' in order. Raise IndexError if more are requested."""
+        self.scores = scores
+        self.pos = 0
+
+    def next_score(self):
+        if self.pos == len(self.scores):
+            raise IndexError(f'Recorded sequence exhausted after {self.pos} scores')
+        score = self.scores[self.pos]
+        self.pos += 1
+        return score
+
+class SourcedGame(Game):
+    def __init__(self, game_id, source):
+        """A baseball_6.Game that gets its scores from 'source'."""
+        super().__init__(game_id)
+        self.source = source
+
+    def step(self):
+        """Get the next score from the source, and apply it."""
+        score = self.source.next_score()
+        if score == OUT:
+            self.handle_out()
+        else:
+            self.handle_score(score)
+        return score
+
+    def run_game(self):
+        while not self.game_over():
+            self.step()
+
+if __name__ == '__main__':
+    import time
+    from random import randint
+
+    # a SeededSource gives the same results as seeding the global generator
+    random.seed(42)
+    game = Game(0)
+    while not game.game_over():
+        score = randint(0, 4)
+        if score == OUT:
+            game.handle_out()
+        else:
+            game.handle_score(score)
+    seeded_game = SourcedGame(0, SeededSource(42))
+    seeded_game.run_game()
+    assert [team.score for team in game.teams] == [team.score for team in seeded_game.teams]
+
+    # a ReplaySource reproduces a recorded game
+    recorded = []
+    source = BlockRandomSource(seed=1)
+    original = SourcedGame(0, source)
+    while not original.game_over():
+        recorded.append(original.step())
+    replayed = SourcedGame(0, ReplaySource(recorded))
+    replayed.run_game()
+    assert [team.score for team in original.teams] == [team.score for team in replayed.teams]
+
+    n_scores = 1_000_000
+    for source in (SeededSource(42), BlockRandomSource(seed=42)):
+        next_score = source.next_score
+        start = time.perf_counter()
+        for _ in range(n_scores):
+            next_score()
+        elapsed = time.perf_counter() - start
+        print(f'{type(source).__name__}: {n_scores / elapsed:,.0f} scores/sec')
@@ -0,0 +1,108 @@
+from baseball_6 import Game, HOME, AWAY
+from baseball_outcomes import BlockRandomSource
+from baseball_scheduler import Scheduler
+
+"""
+Pipeline - create, simulate, persist and discard games in a fixed amount of memory
+
+The __main__ block of baseball_6 creates every game up front, and keeps them all until the
+end. Here each step is a generator, and they are chained together -
+
+    create_games() -> simulate() -> results() -> chunked() -> persist()
+
+Games are only created when there is room in the window of games in progress, and each
+game is released as soon as its result has been taken. At any time, memory holds at most
+'window' games and one chunk of results, however many games are run.
+"""
+
+#----------
+# constants
+#----------
+WINDOW = 1_000
+CHUNK_SIZE = 10_000
+
+#----------------
+# pipeline stages
+#----------------
+
+def create_games(n_games, game_class=Game, first_game_id=0):
+    """Yield 'n_games' new games, one at a time."""
+    for game_id in range(first_game_id, first_game_id + n_games):
+        yield game_class(game_id)
+
+def simulate(games, window=WINDOW, get_score=None):
+    """Run 'games' round-robin, with up to 'window' in progress at once, and yield each game when it is over."""
+    games = iter(games)
+    finished = []
+    scheduler = Scheduler(on_complete=finished.append, get_score=get_score)
+    exhausted = False
+    while True:
+        while not exhausted and len(scheduler) < window:
+            game = next(games, None)
+            if game is None:
+                exhausted = True
+            else:
+                scheduler.add(game)
+        if not len(scheduler) and not finished:
+            return
+        scheduler.run_round()
+        yield from finished
+        finished.clear()
+
+def results(games):
+    """Yield (game_id, home_team_score, away_team_score) for each game, and let the game go."""
+    for game in games:
+        yield game.game_id, game.teams[HOME].score, game.teams[AWAY].score
+
+def chunked(rows, chunk_size=CHUNK_SIZE):
+    """Yield lists of up to 'chunk_size' rows."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def persist(chunks, sink):
+    """Pass each chunk to sink(), and return the number of rows.
+
+    For example, sink could be DatabaseWriter.put_many, or a function that adds the rows to a ScoreStats.
+    """
+    rows = 0
+    for chunk in chunks:
+        sink(chunk)
+        rows += len(chunk)
+    return rows
+
+def run_pipeline(n_games, sink, window=WINDOW, chunk_size=CHUNK_SIZE, seed=None):
+    """Run 'n_games' games through the whole pipeline, and return the number of results passed to sink()."""
+    source = BlockRandomSource(seed)
+    games = create_games(n_games)
+    finished = simulate(games, window, get_score=source.next_score)
+    return persist(chunked(results(finished), chunk_size), sink)
+
+if __name__ == '__main__':
+    import sys
+    import time
+    import tracemalloc
+
+    from baseball_stats import ScoreStats
+
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    stats = ScoreStats()
+
+    def add_chunk(chunk):
+        for game_id, home_score, away_score in chunk:
+            stats.add(home_score, away_score)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = run_pipeline(n_games, add_chunk, window=500, chunk_size=1_000, seed=42)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f'{rows:,} games in {elapsed:.2f} seconds, peak memory {peak / 1024:,.0f} KiB')
+    stats.print_results()
@@ -0,0 +1,164 @@
+from array import array
+
+from baseball_6 import Game, HOME, AWAY, OUT
+
+"""
+Player statistics - record what each player in the lineup did
+
+The counts are kept in one preallocated array of integers, indexed by team, lineup slot
+and statistic, instead of a dict or object per player -
+    counts[(team * 9 + slot) * N_STATS + stat]
+Many games can share one PlayerStats, so totals over millions of games are added up as
+the games are played, with nothing to combine at the end. PlayerStats from different
+workers can be merged, and written to the database in one executemany().
+"""
+
+#----------
+# constants
+#----------
+PLATE_APPEARANCES = 0
+SINGLES = 1
+DOUBLES = 2
+TRIPLES = 3
+HOME_RUNS = 4
+OUTS = 5
+RUNS = 6
+STAT_NAMES = ('plate_appearances', 'singles', 'doubles', 'triples', 'home_runs', 'outs', 'runs')
+N_STATS = len(STAT_NAMES)
+
+# column in the counts for each score - OUT is 0, single is 1, ... home run is 4
+SCORE_STATS = (OUTS, SINGLES, DOUBLES, TRIPLES, HOME_RUNS)
+
+# for each score, the bases whose players reach home base
+RUNNER_BASES = ((), (3,), (2, 3), (1, 2, 3), (1, 2, 3))
+
+TEAM_NAMES = ('Home', 'Away')
+LINEUP = [chr(i+65) for i in range(9)]  # the same players as baseball_6.Team
+
+#---------------
+# define classes
+#---------------
+
+class PlayerStats:
+    def __init__(self):
+        self.counts = array('q', bytes(2 * 9 * N_STATS * array('q').itemsize))
+
+    def merge(self, other):
+        """Add the counts from 'other' to this one."""
+        counts = self.counts
+        for pos, count in enumerate(other.counts):
+            counts[pos] += count
+
+    def get(self, team, slot, stat):
+        return self.counts[(team * 9 + slot) * N_STATS + stat]
+
+    def rows(self):
+        """Yield (team, slot, player, count for each stat) for every player."""
+        for team in (HOME, AWAY):
+            for slot, player in enumerate(LINEUP):
+                pos = (team * 9 + slot) * N_STATS
+                yield (team, slot, player, *self.counts[pos:pos+N_STATS])
+
+    def leaderboard(self, stat, top=5):
+        """Return the 'top' players for 'stat', as a list of (count, team, player)."""
+        leaders = [(row[3+stat], row[0], row[2]) for row in self.rows()]
+        leaders.sort(reverse=True)
+        return leaders[:top]
+
+    def print_leaderboard(self, stat, top=5):
+        print(f'Top {top} - {STAT_NAMES[stat]}')
+        for count, team, player in self.leaderboard(stat, top):
+            print(f'    {TEAM_NAMES[team]} {player}: {count:,}')
+
+class StatsGame(Game):
+    def __init__(self, game_id, stats=None):
+        """A baseball_6.Game that counts what each player does.
+
+        stats - a PlayerStats to add the counts to, which can be shared by many games.
+            If not given, the game gets its own.
+        """
+        self.stats = PlayerStats() if stats is None else stats
+        super().__init__(game_id)
+
+    # the counts are updated inline, and Game's methods called directly rather than through
+    # super(), to keep the extra cost per pitch as small as possible
+
+    def handle_out(self):
+        counts = self.stats.counts
+        pos = (self.batting * 9 + ord(self.bases[0]) - 65) * N_STATS
+        counts[pos + PLATE_APPEARANCES] += 1
+        counts[pos + OUTS] += 1
+        Game.handle_out(self)
+
+    def handle_score(self, score):
+        counts = self.stats.counts
+        bases = self.bases
+        team_pos = self.batting * 9 * N_STATS
+        pos = team_pos + (ord(bases[0]) - 65) * N_STATS
+        counts[pos + PLATE_APPEARANCES] += 1
+        counts[pos + SCORE_STATS[score]] += 1
+
+        # count a run for each player that will reach home base
+        for base in RUNNER_BASES[score]:
+            if bases[base] is not None:
+                counts[team_pos + (ord(bases[base]) - 65) * N_STATS + RUNS] += 1
+        if score == 4:  # home run - the batter scores as well
+            counts[pos + RUNS] += 1
+        Game.handle_score(self, score)
+
+#---------
+# database
+#---------
+
+def setup_player_stats(conn):
+    cur = conn.cursor()
+    columns = ',\n'.join(f'{name} INT' for name in STAT_NAMES)
+    sql = f"""
+        CREATE TABLE IF NOT EXISTS player_stats (
+        run_id INT,
+        team INT,
+        slot INT,
+        player TEXT,
+        {columns},
+        PRIMARY KEY (run_id, team, slot)
+        )
+        """
+    cur.execute(sql)
+
+def persist_player_stats(conn, stats, run_id=0):
+    """Write one row per player for 'run_id', adding to any counts already there."""
+    columns = ', '.join(STAT_NAMES)
+    updates = ', '.join(f'{name} = {name} + excluded.{name}' for name in STAT_NAMES)
+    sql = f"""
+        INSERT INTO player_stats (run_id, team, slot, player, {columns})
+        VALUES (?, ?, ?, ?, {', '.join('?' * N_STATS)})
+        ON CONFLICT (run_id, team, slot) DO UPDATE SET {updates}
+        """
+    conn.executemany(sql, [(run_id, *row) for row in stats.rows()])
+    conn.commit()
+
+if __name__ == '__main__':
+    import sqlite3
+    from random import randint
+
+    stats = PlayerStats()
+    games = [StatsGame(game_id, stats) for game_id in range(1_000)]
+    for game in games:
+        while not game.game_over():
+            score = randint(0, 4)
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+
+    # every run scored is credited to one player
+    total_runs = sum(game.teams[HOME].score + game.teams[AWAY].score for game in games)
+    assert total_runs == sum(row[3+RUNS] for row in stats.rows())
+
+    stats.print_leaderboard(HOME_RUNS)
+    stats.print_leaderboard(RUNS)
+
+    conn = sqlite3.connect(':memory:')
+    setup_player_stats(conn)
+    persist_player_stats(conn, stats)
+    print(conn.execute('SELECT SUM(plate_appearances), SUM(runs) FROM player_stats').fetchone())
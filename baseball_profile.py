@@ -0,0 +1,166 @@
+import functools
+import json
+import time
+
+from baseball_6 import Game, OUT
+
+"""
+Profiling hooks - count calls and measure time in the Game methods on the hot path
+
+Profiler.enable() replaces the methods on the Game class with timing wrappers, and disable()
+puts the original methods back. While disabled, Game is completely unchanged, so there is
+no cost at all.
+
+Times are cumulative, so the time for handle_score() includes the time spent in the
+check_run() and check_move() calls it makes.
+
+Usage -
+    with Profiler() as profiler:
+        ... run games as usual ...
+    print(profiler.report())
+"""
+
+#----------
+# constants
+#----------
+METHODS = ('game_over', 'get_batter', 'check_run', 'check_move', 'handle_out', 'handle_score')
+PITCH_METHODS = ('handle_out', 'handle_score')
+OUTCOMES = ('out', 'single', 'double', 'triple', 'home run')
+
+#---------------
+# define classes
+#---------------
+
+class Profiler:
+    def __init__(self, game_class=Game, methods=METHODS):
+        self.game_class = game_class
+        self.methods = methods
+        self.originals = {}  # name: (method, True if defined on game_class itself)
+
+        # each of these holds [calls, seconds]
+        self.by_method = {name: [0, 0.0] for name in methods}
+        self.by_outcome = {score: [0, 0.0] for score in range(len(OUTCOMES))}
+        self.by_game = {}
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    def enable(self):
+        """Replace each method on the game class with a timing wrapper. Does nothing if already enabled."""
+        if self.originals:
+            return
+        for name in self.methods:
+            method = getattr(self.game_class, name)  # may be inherited, e.g. for SourcedGame
+            self.originals[name] = (method, name in self.game_class.__dict__)
+            setattr(self.game_class, name, self.wrap(name, method))
+
+    def disable(self):
+        """Put the original methods back, and remove the wrappers for inherited methods."""
+        for name, (method, own) in self.originals.items():
+            if own:
+                setattr(self.game_class, name, method)
+            else:
+                delattr(self.game_class, name)
+        self.originals = {}
+
+    def wrap(self, name, method):
+        stats = self.by_method[name]
+        timer = time.perf_counter
+
+        if name not in PITCH_METHODS:
+            @functools.wraps(method)
+            def wrapper(game, *args, **kwargs):
+                start = timer()
+                try:
+                    return method(game, *args, **kwargs)
+                finally:
+                    stats[0] += 1
+                    stats[1] += timer() - start
+            return wrapper
+
+        # handle_out() and handle_score() are called once per pitch, so also record the
+        # time by outcome and by game
+        by_outcome = self.by_outcome
+        by_game = self.by_game
+
+        @functools.wraps(method)
+        def pitch_wrapper(game, *args, **kwargs):
+            start = timer()
+            try:
+                return method(game, *args, **kwargs)
+            finally:
+                elapsed = timer() - start
+                stats[0] += 1
+                stats[1] += elapsed
+                score = kwargs.get('score', args[0] if args else OUT)
+                outcome = by_outcome[score]
+                outcome[0] += 1
+                outcome[1] += elapsed
+                game_stats = by_game.get(game.game_id)
+                if game_stats is None:
+                    game_stats = by_game[game.game_id] = [0, 0.0]
+                game_stats[0] += 1
+                game_stats[1] += elapsed
+        return pitch_wrapper
+
+    #----------------------
+    # reporting the results
+    #----------------------
+
+    def as_dict(self):
+        return {
+            'methods': {name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in self.by_method.items()},
+            'outcomes': {OUTCOMES[score]: {'calls': calls, 'seconds': seconds}
+                for score, (calls, seconds) in self.by_outcome.items()},
+            'games': {str(game_id): {'pitches': pitches, 'seconds': seconds}
+                for game_id, (pitches, seconds) in self.by_game.items()},
+            }
+
+    def dump(self, path):
+        """Write the results to 'path' as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def report(self, top_games=5):
+        """Return the results as a printable report."""
+        lines = [f'{"method":<14}{"calls":>12}{"seconds":>12}{"usec/call":>12}']
+        for name, (calls, seconds) in sorted(self.by_method.items(), key=lambda item: -item[1][1]):
+            lines.append(f'{name:<14}{calls:>12,}{seconds:>12.4f}{per_call(calls, seconds):>12.3f}')
+
+        lines.append('')
+        lines.append(f'{"outcome":<14}{"calls":>12}{"seconds":>12}{"usec/call":>12}')
+        for score, (calls, seconds) in self.by_outcome.items():
+            lines.append(f'{OUTCOMES[score]:<14}{calls:>12,}{seconds:>12.4f}{per_call(calls, seconds):>12.3f}')
+
+        if self.by_game:
+            lines.append('')
+            lines.append(f'{len(self.by_game)} games - slowest {min(top_games, len(self.by_game))}')
+            lines.append(f'{"game_id":<14}{"pitches":>12}{"seconds":>12}{"usec/call":>12}')
+            slowest = sorted(self.by_game.items(), key=lambda item: -item[1][1])[:top_games]
+            for game_id, (pitches, seconds) in slowest:
+                lines.append(f'{game_id:<14}{pitches:>12,}{seconds:>12.4f}{per_call(pitches, seconds):>12.3f}')
+        return '\n'.join(lines)
+
+def per_call(calls, seconds):
+    """Return the average microseconds per call."""
+    return seconds / calls * 1_000_000 if calls else 0.0
+
+if __name__ == '__main__':
+    from random import randint
+
+    games = [Game(game_id) for game_id in range(100)]
+    with Profiler() as profiler:
+        while not all(game.game_over() for game in games):
+            for game in games:
+                if not game.game_over():
+                    score = randint(0, 4)
+                    if score == OUT:
+                        game.handle_out()
+                    else:
+                        game.handle_score(score)
+    print(profiler.report())
@@ -0,0 +1,94 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from baseball_6 import Game, HOME, AWAY, OUT
+
+"""
+Run a large number of games across several processes
+
+Each worker gets its own random.Random, seeded from the run seed and the worker number,
+so the same seed and number of workers always gives the same results.
+
+Only the scores are sent back to the parent, as two compact arrays per worker.
+"""
+
+#----------
+# functions
+#----------
+
+def worker_rng(seed, worker):
+    """Return an independent, reproducible random number generator for this worker.
+
+    If seed is None, the generator is seeded from the operating system, so is not reproducible.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(f'{seed}:{worker}')
+
+def split_games(n_games, workers):
+    """Split 'n_games' into one (first_game_id, n_games) chunk per worker."""
+    size, extra = divmod(n_games, workers)
+    chunks = []
+    first_game_id = 0
+    for worker in range(workers):
+        count = size + (worker < extra)
+        chunks.append((first_game_id, count))
+        first_game_id += count
+    return chunks
+
+def simulate_chunk(worker, seed, first_game_id, n_games):
+    """Run 'n_games' games in this worker, and return the home and away scores as arrays."""
+    randint = worker_rng(seed, worker).randint
+    home_scores = array('i')
+    away_scores = array('i')
+    for game_id in range(first_game_id, first_game_id + n_games):
+        game = Game(game_id)
+        while not game.game_over():
+            score = randint(0, 4)
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+        home_scores.append(game.teams[HOME].score)
+        away_scores.append(game.teams[AWAY].score)
+    return home_scores, away_scores
+
+def run_games(n_games, workers=None, seed=0):
+    """Run 'n_games' games across 'workers' processes.
+
+    Return the home and away scores as arrays, in game_id order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = split_games(n_games, workers)
+
+    home_scores = array('i')
+    away_scores = array('i')
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            simulate_chunk,
+            range(workers),
+            [seed] * workers,
+            [first_game_id for first_game_id, count in chunks],
+            [count for first_game_id, count in chunks],
+            )
+        for home, away in results:
+            home_scores.extend(home)
+            away_scores.extend(away)
+    return home_scores, away_scores
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    start = time.perf_counter()
+    home_scores, away_scores = run_games(n_games, seed=42)
+    elapsed = time.perf_counter() - start
+
+    home_wins = sum(home > away for home, away in zip(home_scores, away_scores))
+    away_wins = sum(home < away for home, away in zip(home_scores, away_scores))
+    print(f'{n_games} games in {elapsed:.2f} seconds ({n_games / elapsed:,.0f} games/sec)')
+    print(f'Home team won {home_wins}. Away team won {away_wins}. Draws {n_games - home_wins - away_wins}.')
@@ -0,0 +1,95 @@
+from random import randint
+
+from baseball_6 import Game, OUT
+
+"""
+Scheduler for running many games at once
+
+The loop in baseball_6 calls game_over() on every game, finished or not, on every round.
+The Scheduler only holds the games that are still in progress. Each round, every live game
+gets one pitch, in the order the games were added - the same order as the baseball_6 loop,
+so the same random sequence gives the same results. A game is dropped as soon as it is over,
+and on_complete(game) is called.
+"""
+
+#---------------
+# define classes
+#---------------
+
+class Scheduler:
+    def __init__(self, games=(), on_complete=None, get_score=None):
+        """Run 'games' round-robin until they are all over.
+
+        on_complete - if given, called with each game as soon as it is over
+        get_score - if given, called to get the next score, else randint(0, 4) is used
+        """
+        self.live = []
+        self.on_complete = on_complete
+        self.get_score = get_score
+        self.rounds = 0
+        for game in games:
+            self.add(game)
+
+    def __len__(self):
+        """Return the number of games still in progress."""
+        return len(self.live)
+
+    def add(self, game):
+        """Add a game. It joins the round-robin from the next round."""
+        if game.game_over():
+            self.complete(game)
+        else:
+            self.live.append(game)
+
+    def complete(self, game):
+        if self.on_complete is not None:
+            self.on_complete(game)
+
+    def run_round(self):
+        """Give every live game one pitch, and drop the games that are now over."""
+        get_score = self.get_score
+        still_live = []
+        for game in self.live:
+            score = randint(0, 4) if get_score is None else get_score()
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+            if game.game_over():
+                self.complete(game)
+            else:
+                still_live.append(game)
+        self.live = still_live
+        self.rounds += 1
+
+    def run(self):
+        """Run rounds until every game is over."""
+        while self.live:
+            self.run_round()
+
+if __name__ == '__main__':
+    import random
+
+    # run the same games with the baseball_6 loop and with the Scheduler, and check they agree
+    random.seed(42)
+    games = [Game(game_id) for game_id in range(100)]
+    while not all(game.game_over() for game in games):
+        for game in games:
+            if not game.game_over():
+                score = randint(0, 4)
+                if score == OUT:
+                    game.handle_out()
+                else:
+                    game.handle_score(score)
+
+    random.seed(42)
+    finished = []
+    scheduler = Scheduler((Game(game_id) for game_id in range(100)), on_complete=finished.append)
+    scheduler.run()
+
+    finished.sort(key=lambda game: game.game_id)
+    for game, scheduled in zip(games, finished):
+        assert [team.score for team in game.teams] == [team.score for team in scheduled.teams]
+    print(f'{len(finished)} games completed in {scheduler.rounds} rounds')
+    for game in finished[:3]:
+        game.print_results()
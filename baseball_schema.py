@@ -0,0 +1,225 @@
+import time
+
+from baseball_6 import Game, HOME, AWAY
+
+"""
+Results schema - runs, games and line scores, with indexes and pre-aggregated summaries
+
+    runs - one row per simulation run
+    games - one row per game, keyed by (run_id, game_id)
+    line_scores - one row per half-innings, keyed by (run_id, game_id, team, innings)
+
+Reports over tens of millions of rows cannot scan the detail tables every time, so when a
+run is finished, finish_run() aggregates it once into two small summary tables -
+    score_counts - number of games for each (home_team_score, away_team_score)
+    innings_counts - number of half-innings for each (team, innings, runs)
+The query functions at the bottom read only the summary tables.
+"""
+
+#-----------
+# the schema
+#-----------
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id INTEGER PRIMARY KEY,
+        started REAL,
+        engine TEXT,
+        seed INT,
+        n_games INT DEFAULT 0,
+        finished INT DEFAULT 0
+        );
+
+    CREATE TABLE IF NOT EXISTS games (
+        run_id INT NOT NULL,
+        game_id INT NOT NULL,
+        home_team_score INT,
+        away_team_score INT,
+        PRIMARY KEY (run_id, game_id)
+        ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS games_scores
+        ON games (run_id, home_team_score, away_team_score);
+
+    CREATE TABLE IF NOT EXISTS line_scores (
+        run_id INT NOT NULL,
+        game_id INT NOT NULL,
+        team INT NOT NULL,
+        innings INT NOT NULL,
+        runs INT,
+        PRIMARY KEY (run_id, game_id, team, innings)
+        ) WITHOUT ROWID;
+
+    CREATE INDEX IF NOT EXISTS line_scores_runs
+        ON line_scores (run_id, team, innings, runs);
+
+    CREATE TABLE IF NOT EXISTS score_counts (
+        run_id INT NOT NULL,
+        home_team_score INT NOT NULL,
+        away_team_score INT NOT NULL,
+        games INT,
+        PRIMARY KEY (run_id, home_team_score, away_team_score)
+        ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS innings_counts (
+        run_id INT NOT NULL,
+        team INT NOT NULL,
+        innings INT NOT NULL,
+        runs INT NOT NULL,
+        half_innings INT,
+        PRIMARY KEY (run_id, team, innings, runs)
+        ) WITHOUT ROWID;
+    """
+
+def setup_schema(conn):
+    """Create the tables and indexes, if they do not already exist."""
+    conn.executescript(SCHEMA)
+
+#---------------
+# define classes
+#---------------
+
+class LineScoreGame(Game):
+    def __init__(self, game_id):
+        """A baseball_6.Game that also records the runs scored in each half-innings."""
+        super().__init__(game_id)
+        self.line_score = [[], []]
+        self.innings_start_score = [0, 0]
+
+    def handle_out(self):
+        batting = self.batting
+        super().handle_out()
+        if self.batting != batting:  # the innings has ended
+            score = self.teams[batting].score
+            self.line_score[batting].append(score - self.innings_start_score[batting])
+            self.innings_start_score[batting] = score
+
+#----------------
+# writing results
+#----------------
+
+def start_run(conn, engine='baseball_6', seed=None):
+    """Add a new run, and return its run_id."""
+    cur = conn.execute(
+        'INSERT INTO runs (started, engine, seed) VALUES (?, ?, ?)',
+        (time.time(), engine, seed),
+        )
+    return cur.lastrowid
+
+def insert_games(conn, run_id, games):
+    """Insert the scores and line scores for 'games'.
+
+    Line scores are only written for games that recorded them, such as LineScoreGame.
+    """
+    games = list(games)
+    conn.executemany(
+        'INSERT INTO games (run_id, game_id, home_team_score, away_team_score) VALUES (?, ?, ?, ?)',
+        [(run_id, game.game_id, game.teams[HOME].score, game.teams[AWAY].score) for game in games],
+        )
+    conn.executemany(
+        'INSERT INTO line_scores (run_id, game_id, team, innings, runs) VALUES (?, ?, ?, ?, ?)',
+        [
+            (run_id, game.game_id, team, innings, runs)
+            for game in games if hasattr(game, 'line_score')
+            for team in (HOME, AWAY)
+            for innings, runs in enumerate(game.line_score[team], start=1)
+            ],
+        )
+
+def finish_run(conn, run_id):
+    """Build the summary tables for 'run_id', and mark it as finished."""
+    conn.execute('DELETE FROM score_counts WHERE run_id = ?', (run_id,))
+    conn.execute('DELETE FROM innings_counts WHERE run_id = ?', (run_id,))
+    conn.execute(
+        """
+        INSERT INTO score_counts (run_id, home_team_score, away_team_score, games)
+        SELECT run_id, home_team_score, away_team_score, COUNT(*)
+        FROM games WHERE run_id = ?
+        GROUP BY home_team_score, away_team_score
+        """, (run_id,))
+    conn.execute(
+        """
+        INSERT INTO innings_counts (run_id, team, innings, runs, half_innings)
+        SELECT run_id, team, innings, runs, COUNT(*)
+        FROM line_scores WHERE run_id = ?
+        GROUP BY team, innings, runs
+        """, (run_id,))
+    conn.execute(
+        """
+        UPDATE runs SET finished = 1,
+            n_games = (SELECT COALESCE(SUM(games), 0) FROM score_counts WHERE run_id = ?)
+        WHERE run_id = ?
+        """, (run_id, run_id))
+    conn.commit()
+
+#----------------
+# query functions
+#----------------
+
+def win_rates(conn, run_id):
+    """Return (home_win, away_win, draw) as fractions of the games in 'run_id'."""
+    home_wins, away_wins, draws = conn.execute(
+        """
+        SELECT
+            COALESCE(SUM(CASE WHEN home_team_score > away_team_score THEN games END), 0),
+            COALESCE(SUM(CASE WHEN home_team_score < away_team_score THEN games END), 0),
+            COALESCE(SUM(CASE WHEN home_team_score = away_team_score THEN games END), 0)
+        FROM score_counts WHERE run_id = ?
+        """, (run_id,)).fetchone()
+    total = home_wins + away_wins + draws
+    if not total:
+        return 0.0, 0.0, 0.0
+    return home_wins / total, away_wins / total, draws / total
+
+def score_histogram(conn, run_id, team=HOME):
+    """Return {score: games} for 'team' in 'run_id'."""
+    column = 'home_team_score' if team == HOME else 'away_team_score'
+    rows = conn.execute(
+        f"""
+        SELECT {column}, SUM(games) FROM score_counts
+        WHERE run_id = ? GROUP BY {column} ORDER BY {column}
+        """, (run_id,))
+    return dict(rows)
+
+def runs_per_innings(conn, run_id, team=None):
+    """Return {innings: average runs} in 'run_id', for one team or (if team is None) both."""
+    sql = """
+        SELECT innings, SUM(runs * half_innings) * 1.0 / SUM(half_innings)
+        FROM innings_counts WHERE run_id = ?
+        """
+    params = [run_id]
+    if team is not None:
+        sql += ' AND team = ?'
+        params.append(team)
+    sql += ' GROUP BY innings ORDER BY innings'
+    return dict(conn.execute(sql, params))
+
+if __name__ == '__main__':
+    import sqlite3
+    from random import randint
+
+    from baseball_6 import OUT
+
+    conn = sqlite3.connect(':memory:')
+    setup_schema(conn)
+    run_id = start_run(conn)
+
+    games = [LineScoreGame(game_id) for game_id in range(10_000)]
+    for game in games:
+        while not game.game_over():
+            score = randint(0, 4)
+            if score == OUT:
+                game.handle_out()
+            else:
+                game.handle_score(score)
+    insert_games(conn, run_id, games)
+    finish_run(conn, run_id)
+
+    start = time.perf_counter()
+    home_win, away_win, draw = win_rates(conn, run_id)
+    histogram = score_histogram(conn, run_id)
+    innings = runs_per_innings(conn, run_id)
+    print(f'Queries took {(time.perf_counter() - start) * 1000:.2f} milliseconds')
+    print(f'Home team won {home_win:.2%}. Away team won {away_win:.2%}. Result was a draw {draw:.2%}.')
+    print(f'Most common home score is {max(histogram, key=histogram.get)}')
+    print('Average runs per innings: ' + ', '.join(f'{runs:.2f}' for runs in innings.values()))
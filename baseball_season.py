@@ -0,0 +1,193 @@
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from baseball_analytic import UNIFORM
+from baseball_innings import InningsSampler
+
+"""
+Season simulator - a league of N teams, a round-robin schedule, standings and playoff odds
+
+round_robin() builds the schedule with the circle method - in each matchday every team
+plays once, and over the season every team plays every other team at home and away.
+
+Each matchday's games are played as one batch, using baseball_innings.InningsSampler.
+The standings are kept in arrays indexed by team, and updated after every matchday.
+
+A season is repeated thousands of times to estimate each team's chance of finishing in
+the playoff places. The matchdays do not depend on each other, so the work is split across
+processes, each running its own share of the seasons with its own seeded generators.
+"""
+
+#----------
+# constants
+#----------
+N_TEAMS = 30
+PLAYOFF_SPOTS = 12
+POINTS_FOR_WIN = 2
+POINTS_FOR_DRAW = 1
+
+#----------
+# functions
+#----------
+
+def round_robin(n_teams, legs=2):
+    """Return the schedule as a list of matchdays, each a list of (home, away) teams.
+
+    If n_teams is odd, one team rests on each matchday.
+    """
+    teams = list(range(n_teams))
+    if n_teams % 2:
+        teams.append(None)  # playing None means a rest
+    n = len(teams)
+    first_leg = []
+    for round_number in range(n - 1):
+        matchday = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is None or away is None:
+                continue
+            if (round_number + i) % 2:  # alternate home and away
+                home, away = away, home
+            matchday.append((home, away))
+        first_leg.append(matchday)
+        teams.insert(1, teams.pop())  # keep the first team fixed and rotate the rest
+
+    schedule = []
+    for leg in range(legs):
+        if leg % 2:
+            schedule.extend([[(away, home) for home, away in matchday] for matchday in first_leg])
+        else:
+            schedule.extend(first_leg)
+    return schedule
+
+#---------------
+# define classes
+#---------------
+
+class Standings:
+    def __init__(self, n_teams):
+        self.n_teams = n_teams
+        self.wins = array('i', bytes(4 * n_teams))
+        self.draws = array('i', bytes(4 * n_teams))
+        self.losses = array('i', bytes(4 * n_teams))
+        self.runs_for = array('i', bytes(4 * n_teams))
+        self.runs_against = array('i', bytes(4 * n_teams))
+
+    def add_matchday(self, matchday, home_scores, away_scores):
+        """Update the standings with one matchday's results."""
+        for (home, away), home_score, away_score in zip(matchday, home_scores, away_scores):
+            self.runs_for[home] += home_score
+            self.runs_against[home] += away_score
+            self.runs_for[away] += away_score
+            self.runs_against[away] += home_score
+            if home_score > away_score:
+                self.wins[home] += 1
+                self.losses[away] += 1
+            elif home_score < away_score:
+                self.wins[away] += 1
+                self.losses[home] += 1
+            else:
+                self.draws[home] += 1
+                self.draws[away] += 1
+
+    def points(self, team):
+        return self.wins[team] * POINTS_FOR_WIN + self.draws[team] * POINTS_FOR_DRAW
+
+    def ranking(self, rng):
+        """Return the teams in order - by points, then run difference, then drawing lots."""
+        return sorted(
+            range(self.n_teams),
+            key=lambda team: (self.points(team), self.runs_for[team] - self.runs_against[team], rng.random()),
+            reverse=True,
+            )
+
+class League:
+    def __init__(self, n_teams=N_TEAMS, team_probs=None, playoff_spots=PLAYOFF_SPOTS, legs=2):
+        """A league of 'n_teams'. team_probs is an optional list of outcome probabilities per team."""
+        self.n_teams = n_teams
+        self.team_probs = team_probs or [UNIFORM] * n_teams
+        self.playoff_spots = playoff_spots
+        self.schedule = round_robin(n_teams, legs)
+
+    def simulate_seasons(self, n_seasons, seed=None):
+        """Run 'n_seasons' seasons in this process.
+
+        Return (playoff_counts, total_wins) as arrays indexed by team.
+        """
+        rng = random.Random(seed)
+        samplers = {}  # one sampler per distinct set of probabilities
+        team_sampler = []
+        for probs in self.team_probs:
+            probs = tuple(probs)
+            if probs not in samplers:
+                samplers[probs] = InningsSampler(probs, seed=f'{seed}:{len(samplers)}')
+            team_sampler.append(samplers[probs])
+
+        playoff_counts = array('i', bytes(4 * self.n_teams))
+        total_wins = array('i', bytes(4 * self.n_teams))
+        for _ in range(n_seasons):
+            standings = Standings(self.n_teams)
+            for matchday in self.schedule:
+                home_scores, away_scores = self.play_matchday(matchday, team_sampler)
+                standings.add_matchday(matchday, home_scores, away_scores)
+            for team in standings.ranking(rng)[:self.playoff_spots]:
+                playoff_counts[team] += 1
+            for team in range(self.n_teams):
+                total_wins[team] += standings.wins[team]
+        return playoff_counts, total_wins
+
+    def play_matchday(self, matchday, team_sampler):
+        """Play every game of 'matchday' as one batch, and return (home_scores, away_scores)."""
+        sides = [team for game in matchday for team in game]  # home, away, home, away ...
+        scores = [0] * len(sides)
+        for sampler in set(team_sampler):
+            positions = [pos for pos, team in enumerate(sides) if team_sampler[team] is sampler]
+            for pos, score in zip(positions, sampler.team_scores(len(positions))):
+                scores[pos] = score
+        return scores[0::2], scores[1::2]
+
+    def playoff_odds(self, n_seasons, workers=None, seed=0):
+        """Run 'n_seasons' seasons across 'workers' processes.
+
+        Return (playoff_odds, average_wins) as lists indexed by team.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        InningsSampler(UNIFORM)  # make sure the distribution is cached before the workers start
+        for probs in self.team_probs:
+            InningsSampler(probs)
+
+        size, extra = divmod(n_seasons, workers)
+        shares = [size + (worker < extra) for worker in range(workers)]
+        playoff_counts = [0] * self.n_teams
+        total_wins = [0] * self.n_teams
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            seeds = [f'{seed}:{worker}' for worker in range(workers)]
+            for counts, wins in executor.map(self.simulate_seasons, shares, seeds):
+                for team in range(self.n_teams):
+                    playoff_counts[team] += counts[team]
+                    total_wins[team] += wins[team]
+        return (
+            [count / n_seasons for count in playoff_counts],
+            [wins / n_seasons for wins in total_wins],
+            )
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    n_seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    # the first 5 teams make slightly fewer outs than the rest
+    stronger = (0.19, 0.2025, 0.2025, 0.2025, 0.2025)
+    team_probs = [stronger] * 5 + [UNIFORM] * (N_TEAMS - 5)
+    league = League(N_TEAMS, team_probs)
+    print(f'{len(league.schedule)} matchdays, {sum(len(matchday) for matchday in league.schedule)} games per season')
+
+    start = time.perf_counter()
+    odds, wins = league.playoff_odds(n_seasons, seed=42)
+    print(f'{n_seasons} seasons in {time.perf_counter() - start:.2f} seconds')
+    for team in range(N_TEAMS):
+        print(f'Team {team:>2}: playoff odds {odds[team]:6.1%}, average wins {wins[team]:5.1f}')
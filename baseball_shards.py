@@ -0,0 +1,153 @@
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from baseball_6 import setup_database
+from baseball_bulk import BulkWriter
+from baseball_runner import simulate_chunk, split_games
+
+"""
+Sharded database - each worker writes its own SQLite file, and the files are merged at the end
+
+With one baseball_db file, every writer waits for the same lock. Here each worker process
+runs its share of the games and writes them to its own shard, a database with the same
+scores table as baseball_6.setup_database(), numbering its games from 0.
+
+merge_shards() then attaches the shards to the main database and copies each one across
+with a single INSERT ... SELECT, adding an offset to game_id so that the numbers follow on
+from the previous shard. The rows are added to scores in one transaction. The games are the
+same as baseball_runner.run_games() with the same seed and number of workers, so the merged
+table is the same as a single-writer run.
+"""
+
+#----------
+# constants
+#----------
+MAX_ATTACHED = 10  # SQLite's default limit on attached databases
+
+#----------
+# functions
+#----------
+
+def write_shard(shard_path, worker, seed, n_games):
+    """Run this worker's games, write them to a new shard, and return the number of games."""
+    home_scores, away_scores = simulate_chunk(worker, seed, 0, n_games)
+    if os.path.exists(shard_path):
+        os.remove(shard_path)
+    conn = sqlite3.connect(shard_path)
+    setup_database(conn)
+    with BulkWriter(conn, synchronous='OFF') as writer:
+        writer.write_scores(home_scores, away_scores)
+    conn.close()
+    return n_games
+
+def run_sharded(n_games, directory, workers=None, seed=0):
+    """Run 'n_games' games across 'workers' processes, each writing its own shard in 'directory'.
+
+    Return the shard paths, in worker order.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = split_games(n_games, workers)
+    shard_paths = [os.path.join(directory, f'baseball_shard_{worker}.db') for worker in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(
+            write_shard,
+            shard_paths,
+            range(workers),
+            [seed] * workers,
+            [count for first_game_id, count in chunks],
+            ))
+    return shard_paths
+
+def copy_shards(conn, shard_paths, table, offset):
+    """Attach up to MAX_ATTACHED shards, and copy them into 'table' in one transaction.
+
+    Each shard's game_id is increased by 'offset', which then moves on past that shard's games.
+    Return the offset for the next shard.
+    """
+    conn.commit()  # finish any open transaction, so that BEGIN starts a new one
+    attached = 0
+    try:
+        for pos, shard_path in enumerate(shard_paths):
+            conn.execute('ATTACH DATABASE ? AS ?', (shard_path, f'shard_{pos}'))
+            attached += 1
+        conn.execute('BEGIN')
+        try:
+            for pos in range(len(shard_paths)):
+                sql = f"""
+                    INSERT INTO {table} (game_id, home_team_score, away_team_score)
+                    SELECT game_id + ?, home_team_score, away_team_score
+                    FROM shard_{pos}.scores ORDER BY game_id
+                    """
+                conn.execute(sql, (offset,))
+                offset += conn.execute(f'SELECT COALESCE(MAX(game_id) + 1, 0) FROM shard_{pos}.scores').fetchone()[0]
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        for pos in range(attached):  # DETACH is not allowed inside a transaction
+            conn.execute(f'DETACH DATABASE shard_{pos}')
+    return offset
+
+def merge_shards(conn, shard_paths, setup=True):
+    """Copy every shard into the scores table of 'conn', renumbering game_id so that none collide.
+
+    The rows are added to scores in one transaction, so if the merge fails, scores is left as it
+    was. At most MAX_ATTACHED databases can be attached at once, and a database cannot be
+    detached inside a transaction, so with more shards than that, each group of shards is first
+    copied into a temporary staging table. Return the number of rows merged.
+    """
+    if setup:
+        setup_database(conn)
+    start = conn.execute('SELECT COALESCE(MAX(game_id) + 1, 0) FROM scores').fetchone()[0]
+    groups = [shard_paths[pos:pos+MAX_ATTACHED] for pos in range(0, len(shard_paths), MAX_ATTACHED)]
+    if len(groups) <= 1:
+        return copy_shards(conn, shard_paths, 'main.scores', start) - start
+
+    conn.execute('CREATE TEMP TABLE merge_scores (game_id INT, home_team_score INT, away_team_score INT)')
+    try:
+        offset = start
+        for group in groups:
+            offset = copy_shards(conn, group, 'temp.merge_scores', offset)
+        conn.execute('BEGIN')
+        try:
+            conn.execute("""
+                INSERT INTO main.scores (game_id, home_team_score, away_team_score)
+                SELECT game_id, home_team_score, away_team_score
+                FROM temp.merge_scores ORDER BY rowid
+                """)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute('DROP TABLE temp.merge_scores')
+    return offset - start
+
+if __name__ == '__main__':
+    import tempfile
+    import time
+
+    from baseball_runner import run_games
+
+    n_games = 20_000
+    workers = 4
+    directory = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    shard_paths = run_sharded(n_games, directory, workers, seed=42)
+    conn = sqlite3.connect(os.path.join(directory, 'baseball_db'))
+    rows = merge_shards(conn, shard_paths)
+    print(f'Merged {rows:,} rows from {len(shard_paths)} shards in {time.perf_counter() - start:.2f} seconds')
+
+    # the same games written by a single writer
+    single = sqlite3.connect(':memory:')
+    setup_database(single)
+    with BulkWriter(single) as writer:
+        writer.write_scores(*run_games(n_games, workers, seed=42))
+
+    sql = 'SELECT row_id, game_id, home_team_score, away_team_score FROM scores ORDER BY row_id'
+    assert conn.execute(sql).fetchall() == single.execute(sql).fetchall()
+    print('Merged table is identical to a single-writer run')
@@ -0,0 +1,144 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from baseball_6 import HOME, AWAY
+from baseball_bitmask import BitmaskGame
+from baseball_outcomes import BlockRandomSource
+
+"""
+Shared-memory results - workers write scores straight into one block of shared memory
+
+Instead of sending results back to the parent through a pickled queue, the parent creates
+a block of shared memory with room for every score, laid out as two arrays of 32-bit ints -
+    home scores for game 0 to n_games-1, then away scores for game 0 to n_games-1
+Each worker attaches to the block by name, and writes each game's scores at the offset
+given by its game_id. When the workers are done, the parent reads the same memory in
+place - nothing is copied, and no Python object is created per game on the way back.
+"""
+
+#----------
+# constants
+#----------
+ITEM_SIZE = 4  # bytes per score, as memoryview format 'i'
+
+#---------------
+# define classes
+#---------------
+
+class SharedScores:
+    def __init__(self, n_games, name=None):
+        """Create a new block for 'n_games' games, or if 'name' is given, attach to an existing one."""
+        self.n_games = n_games
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, n_games * 2 * ITEM_SIZE))
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.scores = self.shm.buf[:n_games * 2 * ITEM_SIZE].cast('i')
+        self.home_scores = self.scores[:n_games]
+        self.away_scores = self.scores[n_games:]
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the views and detach. The creator also frees the block."""
+        for view in (self.home_scores, self.away_scores, self.scores):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    #--------------------------------------------
+    # reading the results in place, in the parent
+    #--------------------------------------------
+
+    def summary(self):
+        """Return (home_wins, away_wins, draws, total_home_runs, total_away_runs)."""
+        home_wins = away_wins = 0
+        for home, away in zip(self.home_scores, self.away_scores):
+            if home > away:
+                home_wins += 1
+            elif home < away:
+                away_wins += 1
+        draws = self.n_games - home_wins - away_wins
+        return home_wins, away_wins, draws, sum(self.home_scores), sum(self.away_scores)
+
+    def as_numpy(self):
+        """Return (home_scores, away_scores) as numpy arrays over the shared memory - no copy is made.
+
+        The arrays must be deleted before close() is called.
+        """
+        import numpy as np
+        scores = np.frombuffer(self.scores, dtype=np.int32)
+        return scores[:self.n_games], scores[self.n_games:]
+
+    def rows(self, first_game_id=0):
+        """Yield (game_id, home_team_score, away_team_score), e.g. for baseball_bulk.BulkWriter."""
+        return zip(range(first_game_id, first_game_id + self.n_games), self.home_scores, self.away_scores)
+
+#----------
+# functions
+#----------
+
+def simulate_into(name, n_games, first_game_id, count, seed, worker):
+    """Run games first_game_id to first_game_id+count-1 in a worker, writing the scores into block 'name'."""
+    with SharedScores(n_games, name) as shared:
+        home_scores = shared.home_scores
+        away_scores = shared.away_scores
+        next_score = BlockRandomSource(None if seed is None else f'{seed}:{worker}').next_score
+        for game_id in range(first_game_id, first_game_id + count):
+            game = BitmaskGame(game_id)
+            while not game.game_over():
+                game.play(next_score())
+            home_scores[game_id] = game.scores[HOME]
+            away_scores[game_id] = game.scores[AWAY]
+    return count
+
+def run_games_shared(n_games, workers=None, seed=0):
+    """Run 'n_games' games across 'workers' processes, and return the SharedScores.
+
+    The caller must close() it when finished with the results.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    shared = SharedScores(n_games)
+    size, extra = divmod(n_games, workers)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            first_game_id = 0
+            for worker in range(workers):
+                count = size + (worker < extra)
+                futures.append(executor.submit(
+                    simulate_into, shared.name, n_games, first_game_id, count, seed, worker))
+                first_game_id += count
+            for future in futures:
+                future.result()  # raise any error from the worker
+    except BaseException:
+        shared.close()
+        raise
+    return shared
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    start = time.perf_counter()
+    with run_games_shared(n_games, seed=42) as shared:
+        elapsed = time.perf_counter() - start
+        home_wins, away_wins, draws, home_runs, away_runs = shared.summary()
+        print(f'{n_games:,} games in {elapsed:.2f} seconds')
+        print(f'Average home score is {home_runs / n_games:.3f}. Average away score is {away_runs / n_games:.3f}.')
+        print(f'Home team won {home_wins / n_games:.2%}. Away team won {away_wins / n_games:.2%}. '
+            f'Result was a draw {draws / n_games:.2%}.')
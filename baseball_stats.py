@@ -0,0 +1,135 @@
+import math
+from collections import Counter
+
+from baseball_6 import HOME, AWAY
+
+"""
+Streaming statistics - summarise results as each game finishes, instead of keeping every game
+
+RunningStats keeps the count, mean and variance of a series of values using Welford's method,
+so each update is O(1) and nothing is stored per value. Two RunningStats can be merged, so
+each worker can keep its own and the parent combines them at the end.
+
+ScoreStats keeps RunningStats and a histogram for the home runs, away runs and margin of
+victory (home - away), and the number of home wins, away wins and draws. The histograms only
+have one entry per distinct score, so memory does not grow with the number of games.
+"""
+
+#---------------
+# define classes
+#---------------
+
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences from the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine 'other' into this one."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    def variance(self):
+        """Return the sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+    def __repr__(self):
+        return f'RunningStats(count={self.count}, mean={self.mean:.4f}, stdev={self.stdev():.4f})'
+
+class ScoreStats:
+    def __init__(self):
+        self.home = RunningStats()
+        self.away = RunningStats()
+        self.margin = RunningStats()
+        self.home_histogram = Counter()
+        self.away_histogram = Counter()
+        self.margin_histogram = Counter()
+        self.home_wins = 0
+        self.away_wins = 0
+        self.draws = 0
+
+    def add(self, home_score, away_score):
+        """Add the result of one game."""
+        margin = home_score - away_score
+        self.home.add(home_score)
+        self.away.add(away_score)
+        self.margin.add(margin)
+        self.home_histogram[home_score] += 1
+        self.away_histogram[away_score] += 1
+        self.margin_histogram[margin] += 1
+        if margin > 0:
+            self.home_wins += 1
+        elif margin < 0:
+            self.away_wins += 1
+        else:
+            self.draws += 1
+
+    def add_game(self, game):
+        """Add the result of a finished baseball_6.Game."""
+        self.add(game.teams[HOME].score, game.teams[AWAY].score)
+
+    def add_scores(self, home_scores, away_scores):
+        """Add the results returned by one of the batch or multi-process runners."""
+        for home_score, away_score in zip(home_scores, away_scores):
+            self.add(int(home_score), int(away_score))
+
+    def merge(self, other):
+        """Combine 'other' into this one."""
+        self.home.merge(other.home)
+        self.away.merge(other.away)
+        self.margin.merge(other.margin)
+        self.home_histogram.update(other.home_histogram)
+        self.away_histogram.update(other.away_histogram)
+        self.margin_histogram.update(other.margin_histogram)
+        self.home_wins += other.home_wins
+        self.away_wins += other.away_wins
+        self.draws += other.draws
+
+    @property
+    def games(self):
+        return self.home.count
+
+    def print_results(self):
+        games = self.games
+        if not games:
+            print('No games played')
+            return
+        print(f'{games:,} games. Average home score is {self.home.mean:.3f} (stdev {self.home.stdev():.3f}). '
+            f'Average away score is {self.away.mean:.3f} (stdev {self.away.stdev():.3f}).')
+        print(f'Average margin of victory (home - away) is {self.margin.mean:.3f} (stdev {self.margin.stdev():.3f}).')
+        print(f'Home team won {self.home_wins / games:.2%}. Away team won {self.away_wins / games:.2%}. '
+            f'Result was a draw {self.draws / games:.2%}.')
+
+if __name__ == '__main__':
+    from baseball_outcomes import SourcedGame, SeededSource
+
+    # two 'workers' keep their own stats, which are then merged
+    worker_stats = []
+    for worker in range(2):
+        stats = ScoreStats()
+        source = SeededSource(f'stats:{worker}')
+        for game_id in range(5_000):
+            game = SourcedGame(game_id, source)
+            game.run_game()
+            stats.add_game(game)
+        worker_stats.append(stats)
+
+    total = ScoreStats()
+    for stats in worker_stats:
+        total.merge(stats)
+    total.print_results()
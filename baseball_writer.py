@@ -0,0 +1,228 @@
+import multiprocessing
+import queue
+import sqlite3
+import threading
+import time
+
+from baseball_6 import HOME, AWAY, setup_database
+from baseball_bulk import BulkWriter
+from baseball_outcomes import BlockRandomSource, SourcedGame
+
+"""
+Database writer thread - one thread owns the only connection, and simulators send it results through a queue
+
+If several simulator threads share a cursor, or open their own connections, they compete for
+the SQLite write lock. Instead, every result is put on a bounded queue, and the writer thread
+inserts them in large transactions using baseball_bulk.BulkWriter.
+
+If the queue is full, put() blocks until the writer catches up, so the simulators slow down
+rather than using more and more memory.
+
+Rows are committed when 'transaction_size' of them have built up, or when the oldest one has
+waited 'max_latency' seconds, whichever comes first.
+
+With processes=True the queue is a multiprocessing.Queue, and simulators in other processes
+send their results through writer.sender(). The sender can be passed to a new
+multiprocessing.Process, or to a ProcessPoolExecutor through its initializer.
+"""
+
+#----------
+# constants
+#----------
+QUEUE_SIZE = 10_000
+TRANSACTION_SIZE = 50_000
+MAX_LATENCY = 1.0  # seconds a row can wait before it is committed
+STOP = None  # put on the queue to tell the writer thread to finish
+
+#---------------
+# define classes
+#---------------
+
+class ResultSender:
+    """The simulator end of a DatabaseWriter created with processes=True, for use in another process."""
+    def __init__(self, queue):
+        self.queue = queue
+
+    def put(self, game_id, home_team_score, away_team_score):
+        """Send one result. Blocks while the queue is full."""
+        self.queue.put((game_id, home_team_score, away_team_score))
+
+    def put_game(self, game):
+        """Send the result of a finished baseball_6.Game."""
+        self.put(game.game_id, game.teams[HOME].score, game.teams[AWAY].score)
+
+    def put_many(self, rows):
+        """Send a list of (game_id, home_team_score, away_team_score) as one queue item."""
+        self.queue.put(list(rows))
+
+class DatabaseWriter(threading.Thread):
+    def __init__(self, db_path, queue_size=QUEUE_SIZE, transaction_size=TRANSACTION_SIZE,
+            max_latency=MAX_LATENCY, processes=False, setup=False, wal=True, synchronous='NORMAL'):
+        """Write scores to the database at 'db_path' from a background thread.
+
+        processes - if True, use a multiprocessing.Queue, so other processes can send results
+        setup - if True, create the scores table with baseball_6.setup_database()
+        """
+        super().__init__(name='DatabaseWriter', daemon=True)
+        self.db_path = db_path
+        if processes:
+            self.queue = multiprocessing.Queue(maxsize=queue_size)
+        else:
+            self.queue = queue.Queue(maxsize=queue_size)
+        self.processes = processes
+        self.transaction_size = transaction_size
+        self.max_latency = max_latency
+        self.setup = setup
+        self.wal = wal
+        self.synchronous = synchronous
+        self.rows_written = 0
+        self.stopped = False
+        self.error = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    #----------------------------------------
+    # methods called by the simulator threads
+    #----------------------------------------
+
+    def put(self, game_id, home_team_score, away_team_score):
+        """Send one result. Blocks while the queue is full."""
+        self.check_error()
+        self.queue.put((game_id, home_team_score, away_team_score))
+
+    def put_game(self, game):
+        """Send the result of a finished baseball_6.Game."""
+        self.put(game.game_id, game.teams[HOME].score, game.teams[AWAY].score)
+
+    def put_many(self, rows):
+        """Send a list of (game_id, home_team_score, away_team_score) as one queue item."""
+        self.check_error()
+        self.queue.put(list(rows))
+
+    def sender(self):
+        """Return a ResultSender for simulators in other processes."""
+        if not self.processes:
+            raise ValueError('DatabaseWriter was not created with processes=True')
+        return ResultSender(self.queue)
+
+    def close(self):
+        """Wait for every result to be written, then stop the thread.
+
+        Results from other processes must all have been sent, e.g. by joining the processes, first.
+        """
+        self.queue.put(STOP)
+        self.join()
+        self.check_error()
+
+    def check_error(self):
+        if self.error is not None:
+            raise RuntimeError('Database writer thread failed') from self.error
+
+    #---------------------------------
+    # methods run in the writer thread
+    #---------------------------------
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            if self.setup:
+                setup_database(conn)
+            with BulkWriter(conn, batch_size=self.transaction_size, commit_every=self.transaction_size,
+                    wal=self.wal, synchronous=self.synchronous) as writer:
+                self.write_loop(writer)
+            self.rows_written = writer.rows_written
+            conn.close()
+        except Exception as e:
+            self.error = e
+            self.drain()  # unblock any simulators waiting on a full queue
+
+    def write_loop(self, writer):
+        get = self.queue.get
+        deadline = None  # when the oldest row not yet committed must be committed
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = get(timeout=timeout)
+            except queue.Empty:  # nothing else arrived in time
+                writer.flush()
+                writer.commit()
+                deadline = None
+                continue
+            if item is STOP:
+                self.stopped = True
+                return
+            if isinstance(item, list):
+                for row in item:
+                    writer.write(*row)
+            else:
+                writer.write(*item)
+
+            if not writer.batch and writer.rows_written == writer.rows_committed:
+                deadline = None  # BulkWriter has just committed a full transaction
+            elif deadline is None:
+                deadline = time.monotonic() + self.max_latency
+            elif time.monotonic() >= deadline:  # results are still arriving, but the oldest has waited long enough
+                writer.flush()
+                writer.commit()
+                deadline = None
+
+    def drain(self):
+        """Discard results until close() sends STOP, so no simulator is left blocked on a full queue."""
+        if not self.stopped:
+            while self.queue.get() is not STOP:
+                pass
+
+#----------
+# functions
+#----------
+
+def send_games(writer, first_game_id, n_games):
+    """Run games first_game_id to first_game_id+n_games-1, and send each result to 'writer'.
+
+    'writer' can be a DatabaseWriter, or in another process, a ResultSender.
+    """
+    source = BlockRandomSource(seed=first_game_id)
+    for game_id in range(first_game_id, first_game_id + n_games):
+        game = SourcedGame(game_id, source)
+        game.run_game()
+        writer.put_game(game)
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    def count_rows(db_path):
+        conn = sqlite3.connect(db_path)
+        rows, games = conn.execute('SELECT COUNT(*), COUNT(DISTINCT game_id) FROM scores').fetchone()
+        conn.close()
+        return f'{rows:,} rows, {games:,} distinct games'
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'baseball_db')
+    start = time.perf_counter()
+    with DatabaseWriter(db_path, setup=True) as writer:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for worker in range(4):
+                executor.submit(send_games, writer, worker * 2_500, 2_500)
+    print(f'4 threads: wrote {writer.rows_written:,} rows in {time.perf_counter() - start:.2f} seconds')
+    print(count_rows(db_path))
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'baseball_db')
+    start = time.perf_counter()
+    with DatabaseWriter(db_path, processes=True, setup=True) as writer:
+        sender = writer.sender()
+        processes = [
+            multiprocessing.Process(target=send_games, args=(sender, worker * 2_500, 2_500))
+            for worker in range(4)
+            ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+    print(f'4 processes: wrote {writer.rows_written:,} rows in {time.perf_counter() - start:.2f} seconds')
+    print(count_rows(db_path))